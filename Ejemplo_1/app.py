@@ -1,34 +1,62 @@
+from functools import lru_cache
 from dash import Dash, html, dcc, Input, Output, State
 import dash_bootstrap_components as dbc
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import linear_kernel
+import plotly.express as px
 from src.const import get_constants
 
 from src.dash1 import generate_visualizations as generate_visualizations1
 from src.dash2 import generate_visualizations as generate_visualizations2
 from src.dash3 import generate_visualizations as generate_visualizations3
 from src.dash4 import generate_visualizations as generate_visualizations4
-
-movies = pd.read_csv('./movie_after_cleaning.csv')
-movies_splits = pd.read_excel("./splits_movie.xlsx", sheet_name=None)
-series = pd.read_csv('./series_after_cleaning.csv')
-series_splits = pd.read_excel("./splits_series.xlsx", sheet_name=None)
+from src.datasets import DatasetRegistry, LazyFrame, LazyWorkbook
+from src.recommender import Recommender
+from src.api import register_recommendation_api
+from src.facets import FacetIndex, FACETS
+from src.prefetch import FigurePrefetcher
+
+# Datasets are read lazily: each consumer declares its columns and only those are loaded,
+# the first time they are needed.
+datasets = DatasetRegistry()
+datasets.register('movie', LazyFrame('./movie_after_cleaning.csv'), LazyWorkbook("./splits_movie.xlsx"))
+datasets.register('series', LazyFrame('./series_after_cleaning.csv'), LazyWorkbook("./splits_series.xlsx"))
+
+# Graph tabs: everything but the long description text and the links
+datasets.declare('tabs',
+    movie=['rating', 'votes', 'year', 'duration', 'title', 'genre', 'director', 'writer', 'stars',
+           'country', 'language', 'production_company', 'worldwide_gross', 'parentalguide'],
+    series=['rating', 'votes', 'title', 'type', 'genre', 'creators', 'stars', 'country', 'language',
+            'production_company', 'end_year', 'start_year', 'year', 'parentalguide'])
+datasets.declare('constants', movie=['title', 'votes'], series=['title', 'votes'])
+datasets.declare('options', movie=['title'], series=['title'])
+datasets.declare('links', movie=['title', 'link'], series=['title', 'link'])
+datasets.declare('facets', movie=FACETS, series=FACETS)
+datasets.declare('recommender',
+    movie=['title', 'description', 'genre', 'director', 'writer', 'country'],
+    series=['title', 'description', 'genre', 'creators', 'stars', 'country', 'production_company', 'parentalguide'])
 
 # Define function to load data based on tab selection
 def load_data(tab):
-    if tab == 'movie':
-        return movies, movies_splits
-    elif tab == 'series':
-        return series, series_splits
+    return datasets.frame(tab, 'tabs'), datasets.splits(tab)
 
-num_of_works,num_of_countries,num_of_lang,avg_votes = get_constants(movies, series, movies_splits, series_splits)
+num_of_works,num_of_countries,num_of_lang,avg_votes = get_constants(
+    datasets.frame('movie', 'constants'), datasets.frame('series', 'constants'),
+    datasets.splits('movie'), datasets.splits('series'))
 
 
 # Initialize the app
-app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], title='IMDB Data Analysis Dashboard')
+app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], title='IMDB Data Analysis Dashboard', suppress_callback_exceptions=True)
 server = app.server
 
+# The TF-IDF matrices are fitted once, on the first recommendation, and shared by the
+# dropdown callbacks and the batch endpoint
+recommenders = {
+    'movie': Recommender(lambda: datasets.frame('movie', 'recommender').join(datasets.frame('movie', 'links')[['link']]),
+                         ['description', 'genre', 'director', 'writer', 'country']),
+    'series': Recommender(lambda: datasets.frame('series', 'recommender').join(datasets.frame('series', 'links')[['link']]),
+                          ['description', 'genre', 'creators', 'stars', 'country', 'production_company', 'parentalguide']),
+}
+register_recommendation_api(server, recommenders)
+
 def generate_stats_card (title, value, image_path):
     return html.Div(
         dbc.Card([
@@ -70,8 +98,8 @@ tab_style = {
 MAX_OPTIONS_DISPLAY = 3300
 
 # Generate options for the dropdown
-dropdown_options_movie = [{'label': title, 'value': title} for title in movies['title'][:MAX_OPTIONS_DISPLAY]]
-dropdown_options_series = [{'label': title, 'value': title} for title in series['title'][:MAX_OPTIONS_DISPLAY]]
+dropdown_options_movie = [{'label': title, 'value': title} for title in datasets.frame('movie', 'options')['title'][:MAX_OPTIONS_DISPLAY]]
+dropdown_options_series = [{'label': title, 'value': title} for title in datasets.frame('series', 'options')['title'][:MAX_OPTIONS_DISPLAY]]
 
 
 offcanvas = html.Div(
@@ -120,8 +148,9 @@ app.layout = html.Div([
                     dcc.Tab(label='Overview', value='overview',style=tab_style['idle'],selected_style=tab_style['active']),
                     dcc.Tab(label='Content creators', value='content_creators',style=tab_style['idle'],selected_style=tab_style['active']),
                     dcc.Tab(label='Parental Guide', value='parental',style=tab_style['idle'],selected_style=tab_style['active']),
-                    dcc.Tab(label='Year', value='year',style=tab_style['idle'],selected_style=tab_style['active'])
-                ], style={'marginTop': '15px', 'width':'600px','height':'50px'})
+                    dcc.Tab(label='Year', value='year',style=tab_style['idle'],selected_style=tab_style['active']),
+                    dcc.Tab(label='Facets', value='facets',style=tab_style['idle'],selected_style=tab_style['active'])
+                ], style={'marginTop': '15px', 'width':'700px','height':'50px'})
             ,width=6),
             dbc.Col(offcanvas, width=4)
         ]),
@@ -168,24 +197,11 @@ def toggle_offcanvas_series(n1, is_open):
     return is_open
 
 
-# Function to get recommendations
-def get_recommendations(df, indices, title, cosine_sim):
-    idx = indices[title]
-
-    # Get the pairwsie similarity scores of all movies with that movie
-    sim_scores = list(enumerate(cosine_sim[idx]))
-
-    # Sort the movies based on the similarity scores
-    sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-
-    # Get the scores of the 10 most similar movies
-    sim_scores = sim_scores[1:6]
-
-    # Get the movie indices
-    movie_indices = [i[0] for i in sim_scores]
-
-    # Return the top 10 most similar movies
-    return df['title'].iloc[movie_indices]
+def recommendation_links(recommendations):
+    return html.Div(children=[
+            dcc.Link(f"{i+1} - {data['title']}", href=data['link'], style={'display':'block','color':'#deb522','marginBlock':'10px'}
+                    ,target='_blank') for i, data in enumerate(recommendations)
+    ],style={'marginTop': '10px','textAlign': 'center','color': '#deb522'})
 
 # Callback to update image container based on dropdown selection
 @app.callback(
@@ -193,111 +209,88 @@ def get_recommendations(df, indices, title, cosine_sim):
     [Input('movie-dropdown', 'value')]
 )
 def update_recommendation_movie(selected_movie):
-    df = movies.copy()
-    df["word_cloud"]=movies["description"]+" "+movies["genre"]+" "+movies["director"]+" "+movies["writer"]+" "+movies["country"]
-    tfidf = TfidfVectorizer(stop_words='english')
-    df["word_cloud"] = df["word_cloud"].fillna('')  
-    tfidf_matrix = tfidf.fit_transform(df['word_cloud'])
-    cosine_sim = linear_kernel(tfidf_matrix, tfidf_matrix)
-    indices = pd.Series(df.index, index=df['title']).drop_duplicates()
-
-    if selected_movie:
-        x = []
-        for i in range(0, 5):
-            x.append(movies[movies["title"] == get_recommendations(movies,indices,selected_movie,cosine_sim).iloc[i]][["link","title"]])
-    else:
+    if not selected_movie:
         return []
-    
-    return html.Div(children=[
-            dcc.Link(f"{i+1} - {data['title'].values[0]}", href=data['link'].values[0], style={'display':'block','color':'#deb522','marginBlock':'10px'}
-                    ,target='_blank') for i, data in enumerate(x)
-    ],style={'marginTop': '10px','textAlign': 'center','color': '#deb522'})
+    return recommendation_links(recommenders['movie'].recommend([selected_movie], k=5)[selected_movie])
 
 @app.callback(
     Output('series-recommendation-content', 'children'),
     [Input('series-dropdown', 'value')]
 )
 def update_recommendation_series(selected_series):
-    df = series.copy()
-    df["word_cloud"]=series["description"]+" "+series["genre"]+" "+series["creators"]+" "+series["stars"]+" "+series["country"] +" "+ series['production_company'] +" "+ series['parentalguide']
-    tfidf = TfidfVectorizer(stop_words='english')
-    df["word_cloud"] = df["word_cloud"].fillna('')  
-    tfidf_matrix = tfidf.fit_transform(df['word_cloud'])
-    cosine_sim = linear_kernel(tfidf_matrix, tfidf_matrix)
-    indices = pd.Series(df.index, index=df['title']).drop_duplicates()
-    
-    if selected_series:
-        x = []
-        for i in range(0, 5):
-            x.append(series[series["title"] == get_recommendations(series,indices,selected_series,cosine_sim).iloc[i]][["link", "title"]])
-    else:
+    if not selected_series:
         return []
-    return html.Div(children=[
-            dcc.Link(f"{i+1} - {data['title'].values[0]}", href=data['link'].values[0], style={'display':'block','color':'#deb522','marginBlock':'10px'}
-                    ,target='_blank') for i, data in enumerate(x)
-    ],style={'marginTop': '10px','textAlign': 'center','color': '#deb522'})
+    return recommendation_links(recommenders['series'].recommend([selected_series], k=5)[selected_series])
+
 
+GRAPH_TABS = {
+    'overview': generate_visualizations1,
+    'content_creators': generate_visualizations2,
+    'parental': generate_visualizations3,
+    'year': generate_visualizations4,
+}
+
+# Figures of the tab being viewed are computed on demand; the other tabs of the same dataset
+# are then prefetched in the background so the next switch is served from memory
+tab_figures = FigurePrefetcher({tab: (lambda tab2, generate=generate: generate(*load_data(tab2)))
+                                for tab, generate in GRAPH_TABS.items()})
+
+def graph_grid(figures):
+    return html.Div([
+        html.Div([
+            dcc.Graph(id=f'graph{i+1}', figure=fig),
+        ], style={'width': '50%', 'display': 'inline-block'})
+        for i, fig in enumerate(figures)
+    ])
 
 @app.callback(
     Output('tabs-content', 'children'),
     [Input('graph-tabs', 'value'),Input('tabs', 'value')]
 )
 def update_tab(tab,tab2):
-    data, splits = load_data(tab2)
-
-    if tab == 'overview':
-        fig1, fig2, fig3, fig4 = generate_visualizations1(data, splits)
-        return html.Div([
-        html.Div([
-            dcc.Graph(id='graph1', figure=fig1),
-        ], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([
-            dcc.Graph(id='graph2', figure=fig2),
-        ], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([
-            dcc.Graph(id='graph3', figure=fig3),
-        ], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([
-            dcc.Graph(id='graph4', figure=fig4),
-        ], style={'width': '50%', 'display': 'inline-block'})
-    ])
-    elif tab == 'content_creators':
-        fig1, fig2, fig3, fig4 = generate_visualizations2(data, splits)
+    if tab in GRAPH_TABS:
+        return graph_grid(tab_figures.get(tab, tab2))
+    if tab == 'facets':
+        index = facet_index(tab2)
         return html.Div([
         html.Div([
-            dcc.Graph(id='graph1', figure=fig1),
-        ], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([
-            dcc.Graph(id='graph2', figure=fig2),
-        ], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([
-            dcc.Graph(id='graph3', figure=fig3),
-        ], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([
-            dcc.Graph(id='graph4', figure=fig4),
-        ], style={'width': '50%', 'display': 'inline-block'})
-    ])
-    elif tab == 'parental':
-        fig1, fig2 = generate_visualizations3(data, splits)
-        return html.Div([
+            html.Label('Breakdown by', style={'color': '#deb522', 'fontWeight': 'bold'}),
+            dcc.Dropdown(id='facet-breakdown', options=[{'label': f.replace('_', ' ').title(), 'value': f} for f in FACETS],
+                         value='genre', clearable=False, style={'color': 'black'}),
+        ] + [
+            html.Div([
+                html.Label(field.replace('_', ' ').title(), style={'color': '#deb522', 'fontWeight': 'bold', 'marginTop': '10px'}),
+                dcc.Dropdown(id=f'facet-filter-{field}', options=index.options(field), multi=True,
+                             placeholder='All', style={'color': 'black'}),
+            ]) for field in FACETS
+        ], style={'width': '25%', 'display': 'inline-block', 'verticalAlign': 'top', 'padding': '10px'}),
         html.Div([
-            dcc.Graph(id='graph1', figure=fig1),
-        ], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([
-            dcc.Graph(id='graph2', figure=fig2),
-        ], style={'width': '50%', 'display': 'inline-block'}),
-        ])
-    elif tab == 'year':
-        fig1, fig2 = generate_visualizations4(data, splits)
-        return html.Div([
-        html.Div([
-            dcc.Graph(id='graph1', figure=fig1),
-        ], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([
-            dcc.Graph(id='graph2', figure=fig2),
-        ], style={'width': '50%', 'display': 'inline-block'}),
+            dcc.Graph(id='facet-graph'),
+        ], style={'width': '75%', 'display': 'inline-block'}),
         ])
 
 
+# Inverted index over the multi-valued columns, built once per dataset when it is first shown
+@lru_cache(maxsize=None)
+def facet_index(tab):
+    return FacetIndex(datasets.frame(tab, 'facets'))
+
+
+@app.callback(
+    Output('facet-graph', 'figure'),
+    [Input('facet-breakdown', 'value'), Input('tabs', 'value')] + [Input(f'facet-filter-{field}', 'value') for field in FACETS]
+)
+def update_facets(breakdown, tab2, *selected):
+    index = facet_index(tab2)
+    filters = dict(zip(FACETS, selected))
+    counts = index.counts(breakdown, index.mask(filters)).head(20)
+    counts = counts[counts > 0]
+    fig = px.bar(x=counts.index, y=counts.values, labels={'x': breakdown.replace('_', ' ').title(), 'y': 'Titles'},
+                 title=f"Titles per {breakdown.replace('_', ' ')} (top {len(counts)})", template='plotly_dark')
+    fig.update_traces(marker_color='#deb522')
+    fig.update_layout(plot_bgcolor='black', paper_bgcolor='black', font_color='#deb522')
+    return fig
+
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
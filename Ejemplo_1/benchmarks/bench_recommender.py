@@ -0,0 +1,249 @@
+"""Recommender benchmark: build time, memory, query latency and recall against catalog size.
+
+Synthetic catalogs are sampled from the distributions of movie_after_cleaning.csv
+(description length and vocabulary, number and frequency of genres, directors,
+writers and countries). For every catalog size and scoring strategy it records:
+
+- index build time (TF-IDF fit plus whatever the strategy precomputes),
+- peak memory allocated while building the index (tracemalloc),
+- p50/p99 latency of single-title queries,
+- recall@k against exact cosine similarity.
+
+Run from the Ejemplo_1 folder:
+
+    python -m benchmarks.bench_recommender --sizes 10000 100000 1000000 --output bench_recommender.json
+    python -m benchmarks.bench_recommender --sizes 10000 --compare bench_recommender.json
+"""
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import scipy
+import sklearn
+from sklearn.decomposition import TruncatedSVD
+from sklearn.metrics.pairwise import linear_kernel
+from sklearn.preprocessing import normalize
+
+from src.recommender import Recommender, top_k
+
+PATH = pathlib.Path(__file__).parent.parent
+FIELDS = ['description', 'genre', 'director', 'writer', 'country']
+MULTI_VALUED = ['genre', 'director', 'writer', 'country']
+
+
+# --- Synthetic catalogs ---
+
+def catalog_distributions(path=PATH / 'movie_after_cleaning.csv'):
+    """Empirical distributions of the recommender fields of the real catalog."""
+    df = pd.read_csv(path, usecols=FIELDS)
+    words = df['description'].fillna('').str.split()
+    vocab = words.explode().dropna().value_counts(normalize=True)
+    lengths = words.str.len().value_counts(normalize=True)
+    dist = {'description': (vocab.index.to_numpy(dtype=object), vocab.to_numpy(),
+                            lengths.index.to_numpy(), lengths.to_numpy())}
+    for field in MULTI_VALUED:
+        values = df[field].dropna().str.split(',')
+        frequencies = values.explode().value_counts(normalize=True)
+        counts = values.str.len().value_counts(normalize=True)
+        dist[field] = (frequencies.index.to_numpy(dtype=object), frequencies.to_numpy(),
+                       counts.index.to_numpy(), counts.to_numpy())
+    return dist
+
+
+def _sample_text(n, dist, rng, sep):
+    values, p_values, lengths, p_lengths = dist
+    n_items = rng.choice(lengths, size=n, p=p_lengths)
+    picked = values[rng.choice(len(values), size=int(n_items.sum()), p=p_values)]
+    ends = np.cumsum(n_items)
+    return [sep.join(picked[end - count:end]) for count, end in zip(n_items, ends)]
+
+
+def synthesize_catalog(n, dist, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'title': [f'title-{i}' for i in range(n)],
+        'link': [f'https://example.org/title/{i}' for i in range(n)],
+        'description': _sample_text(n, dist['description'], rng, ' '),
+    })
+    for field in MULTI_VALUED:
+        df[field] = _sample_text(n, dist[field], rng, ',')
+    return df
+
+
+# --- Scoring strategies ---
+
+class FullKernel:
+    """The original callback: the whole N x N similarity matrix, precomputed."""
+    name = 'full_kernel'
+    max_rows = 20_000
+
+    def build(self, df):
+        self.matrix = Recommender(lambda: df, FIELDS).fit()._tfidf_matrix
+        self.similarity = linear_kernel(self.matrix, self.matrix)
+
+    def query(self, rows, k):
+        return top_k(self.similarity[rows].copy(), rows, k)[0]
+
+
+class SparseProduct:
+    """src.recommender: one sparse product of the query rows against the TF-IDF matrix (exact)."""
+    name = 'sparse'
+    max_rows = None
+
+    def build(self, df):
+        self.matrix = Recommender(lambda: df, FIELDS).fit()._tfidf_matrix
+
+    def query(self, rows, k):
+        return top_k((self.matrix[rows] @ self.matrix.T).toarray(), rows, k)[0]
+
+
+class LatentSemantic:
+    """TF-IDF projected to ``n_components`` dense dimensions (approximate)."""
+    name = 'svd'
+    max_rows = None
+    n_components = 128
+
+    def build(self, df):
+        matrix = Recommender(lambda: df, FIELDS).fit()._tfidf_matrix
+        svd = TruncatedSVD(n_components=min(self.n_components, matrix.shape[1] - 1), random_state=0)
+        self.embedding = normalize(svd.fit_transform(matrix)).astype(np.float32)
+
+    def query(self, rows, k):
+        return top_k(self.embedding[rows] @ self.embedding.T, rows, k)[0]
+
+
+STRATEGIES = {cls.name: cls for cls in (FullKernel, SparseProduct, LatentSemantic)}
+# Query rows scored per call when computing the exact reference top-k
+REFERENCE_BATCH = 16
+
+
+# --- Measurements ---
+
+def measure(strategy_cls, df, query_rows, exact, k, memory=True):
+    result = {'strategy': strategy_cls.name}
+    if strategy_cls.max_rows is not None and len(df) > strategy_cls.max_rows:
+        result['skipped'] = f'more than {strategy_cls.max_rows:,} rows'
+        return result
+
+    strategy = strategy_cls()
+    start = time.perf_counter()
+    strategy.build(df)
+    result['build_seconds'] = time.perf_counter() - start
+
+    if memory:
+        # Separate build so tracemalloc overhead does not leak into the build time
+        probe = strategy_cls()
+        tracemalloc.start()
+        probe.build(df)
+        result['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        del probe
+
+    latencies = []
+    hits = 0
+    for i, row in enumerate(query_rows):
+        start = time.perf_counter()
+        top = strategy.query(np.array([row]), k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(np.intersect1d(top[0], exact[i]))
+    latencies = np.array(latencies)
+    result['latency_ms'] = {
+        'p50': float(np.percentile(latencies, 50)),
+        'p99': float(np.percentile(latencies, 99)),
+        'mean': float(latencies.mean()),
+    }
+    result[f'recall_at_{k}'] = hits / (len(query_rows) * k)
+    return result
+
+
+def run(sizes, strategies, n_queries=200, k=5, memory=True, seed=0):
+    dist = catalog_distributions()
+    results = []
+    for size in sizes:
+        df = synthesize_catalog(size, dist, seed=seed)
+        query_rows = np.random.default_rng(seed).choice(size, size=min(n_queries, size), replace=False)
+        reference = SparseProduct()
+        reference.build(df)
+        # In small batches: one dense similarity block for every query row is
+        # n_queries x size floats (1.6 GB at 1M rows) just to get the reference top-k
+        exact = np.vstack([reference.query(query_rows[i:i + REFERENCE_BATCH], k)
+                           for i in range(0, len(query_rows), REFERENCE_BATCH)])
+        del reference
+        for name in strategies:
+            result = {'size': size, **measure(STRATEGIES[name], df, query_rows, exact, k, memory=memory)}
+            print(json.dumps(result))
+            results.append(result)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Print build time, p50/p99 and memory of ``report`` relative to ``baseline``."""
+    previous = {(r['size'], r['strategy']): r for r in baseline['results'] if 'skipped' not in r}
+    for r in report['results']:
+        old = previous.get((r['size'], r['strategy']))
+        if old is None or 'skipped' in r:
+            continue
+        ratios = {
+            'build': r['build_seconds'] / old['build_seconds'],
+            'p50': r['latency_ms']['p50'] / old['latency_ms']['p50'],
+            'p99': r['latency_ms']['p99'] / old['latency_ms']['p99'],
+        }
+        if 'peak_memory_mb' in r and 'peak_memory_mb' in old:
+            ratios['memory'] = r['peak_memory_mb'] / old['peak_memory_mb']
+        print(f"{r['size']:>9,} {r['strategy']:<12} " + '  '.join(f'{key} x{value:.2f}' for key, value in ratios.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('-k', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc build')
+    parser.add_argument('--output', default='bench_recommender.json')
+    parser.add_argument('--compare', help='previous report to compare against')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.strategies, n_queries=args.queries, k=args.k,
+                  memory=not args.no_memory, seed=args.seed)
+    report = {
+        'benchmark': 'recommender',
+        'generated': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'environment': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'numpy': np.__version__,
+            'scipy': scipy.__version__,
+            'scikit-learn': sklearn.__version__,
+            'pandas': pd.__version__,
+        },
+        'parameters': {'sizes': args.sizes, 'queries': args.queries, 'k': args.k, 'seed': args.seed},
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Report written to {args.output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""JSON endpoints registered on the Flask server behind the Dash app."""
+import time
+
+from flask import jsonify, request
+
+DEFAULT_CONFIG = {
+    'RECOMMEND_DEFAULT_K': 5,
+    'RECOMMEND_MAX_K': 20,
+    'RECOMMEND_MAX_TITLES': 1000,
+}
+
+
+def register_recommendation_api(server, recommenders, url='/api/recommendations'):
+    """Expose batch recommendations at ``POST url``.
+
+    Request body: ``{"dataset": "movie" | "series", "titles": [...], "k": 5}``.
+    Every title is scored in a single sparse matrix product. ``k`` is capped
+    by ``RECOMMEND_MAX_K`` and the batch size by ``RECOMMEND_MAX_TITLES`` in
+    ``server.config``. Timings are returned in the ``Server-Timing`` header.
+    """
+    for key, value in DEFAULT_CONFIG.items():
+        server.config.setdefault(key, value)
+
+    def error(message, status=400):
+        return jsonify({'error': message}), status
+
+    @server.route(url, methods=['POST'])
+    def recommendations():
+        start = time.perf_counter()
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict):
+            return error("request body must be a JSON object")
+        dataset = body.get('dataset', 'movie')
+        titles = body.get('titles')
+        k = body.get('k', server.config['RECOMMEND_DEFAULT_K'])
+
+        if dataset not in recommenders:
+            return error(f"unknown dataset '{dataset}', expected one of {sorted(recommenders)}")
+        if not isinstance(titles, list) or not all(isinstance(t, str) for t in titles):
+            return error("'titles' must be a list of strings")
+        if len(titles) > server.config['RECOMMEND_MAX_TITLES']:
+            return error(f"at most {server.config['RECOMMEND_MAX_TITLES']} titles per request", 413)
+        if not isinstance(k, int) or isinstance(k, bool) or k < 1:
+            return error("'k' must be a positive integer")
+        k = min(k, server.config['RECOMMEND_MAX_K'])
+
+        recommender = recommenders[dataset]
+        recommender.fit()
+        fitted = time.perf_counter()
+        results = recommender.recommend(titles, k=k)
+        scored = time.perf_counter()
+
+        response = jsonify({
+            'dataset': dataset,
+            'k': k,
+            'recommendations': results,
+            'missing': [t for t in titles if t not in results],
+        })
+        done = time.perf_counter()
+        response.headers['Server-Timing'] = (
+            f"fit;dur={(fitted - start) * 1000:.2f}, "
+            f"score;dur={(scored - fitted) * 1000:.2f}, "
+            f"total;dur={(done - start) * 1000:.2f}"
+        )
+        response.headers['X-Recommendation-Count'] = str(len(results))
+        return response
+
+    return recommendations
@@ -0,0 +1,159 @@
+"""Raw IMDb export -> cleaned dataset used by the dashboard.
+
+Reproduces movie_after_cleaning.csv from imdb_movies.csv and
+series_after_cleaning.csv from imdb_series.csv. The files are read in
+chunks and every chunk is cleaned with vectorized pandas string
+operations, optionally across a process pool for multi-gigabyte dumps.
+
+    python -m src.cleaning                      # both datasets, single process
+    python -m src.cleaning --workers 8 --chunksize 200000 --kind movie
+"""
+import argparse
+import pathlib
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+PATH = pathlib.Path(__file__).parent.parent
+
+PARENTAL_GUIDE = {
+    'G': 'Kids', 'TV-G': 'Kids', 'TV-Y': 'Kids',
+    'PG': 'Kids - with parental guidence', 'TV-PG': 'Kids - with parental guidence',
+    'GP': 'Kids - with parental guidence', 'M/PG': 'Kids - with parental guidence',
+    'Approved': 'Kids - with parental guidence', 'Passed': 'Kids - with parental guidence',
+    'PG-13': 'Teens - Age above 12', '13+': 'Teens - Age above 12',
+    'TV-14': 'Teens - Age above 14',
+    'R': 'Adults', 'NC-17': 'Adults', 'TV-MA': 'Adults', 'X': 'Adults', 'M': 'Adults', '18+': 'Adults',
+    'TV-Y7': 'TV-Y7', 'TV-Y7-FV': 'TV-Y7-FV',
+    'Not Rated': 'Not Rated', 'Unrated': 'Not Rated',
+}
+
+MOVIE_COLUMNS = ['link', 'description', 'rating', 'votes', 'year', 'duration', 'title', 'genre', 'director',
+                 'writer', 'stars', 'country', 'language', 'production_company', 'worldwide_gross', 'parentalguide']
+SERIES_COLUMNS = ['link', 'description', 'rating', 'votes', 'title', 'type', 'genre', 'creators', 'stars',
+                  'country', 'language', 'production_company', 'end_year', 'start_year', 'year', 'parentalguide']
+
+DURATION = r'^\s*(?:(?P<hours>\d+)\s*h(?:ours?)?)?\s*(?:(?P<minutes>\d+)\s*m(?:in(?:utes?)?)?)?\s*$'
+YEAR_SPAN = r'^\s*(?P<start>\d{4})\s*[–-]?\s*(?P<end>\d{4})?'
+
+
+def parse_count(s):
+    """'2,850,860' -> 2850860"""
+    return pd.to_numeric(s.astype('string').str.replace(',', '', regex=False), errors='coerce').astype('Int64')
+
+
+def parse_money(s):
+    """'$28,884,716' -> 28884716.0"""
+    return pd.to_numeric(s.astype('string').str.replace(r'[$,\s]', '', regex=True), errors='coerce').astype('float64')
+
+
+def parse_duration(s):
+    """'2h 22m', '50 hours 30 minutes', '45m' -> minutes"""
+    parts = s.astype('string').str.extract(DURATION)
+    hours = pd.to_numeric(parts['hours'], errors='coerce')
+    minutes = pd.to_numeric(parts['minutes'], errors='coerce')
+    total = hours.fillna(0) * 60 + minutes.fillna(0)
+    return total.where(hours.notna() | minutes.notna()).astype('Int64')
+
+
+def parse_year_span(s):
+    """'2008–2013' -> (2008, '2013'); '2023–' and '2016' -> (2023, 'unfinished'), (2016, 'unfinished')"""
+    parts = s.astype('string').str.extract(YEAR_SPAN)
+    start = pd.to_numeric(parts['start'], errors='coerce').astype('Int64')
+    end = parts['end'].astype(object).fillna('unfinished')
+    return start, end
+
+
+def parental_guide(s):
+    return s.map(PARENTAL_GUIDE).fillna('Not Rated')
+
+
+def clean_movies(df):
+    out = df.copy()
+    out['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+    out['votes'] = parse_count(df['votes'])
+    year = pd.to_numeric(df['year'], errors='coerce').astype('Int64')
+    out['year'] = (year.astype('string') + '-01-01').astype(object)
+    out['duration'] = parse_duration(df['duration'])
+    out['worldwide_gross'] = parse_money(df['worldwide_gross'])
+    out['parentalguide'] = parental_guide(df['certificate'])
+    return out[MOVIE_COLUMNS]
+
+
+def clean_series(df):
+    out = df.copy()
+    out['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+    out['votes'] = parse_count(df['votes'])
+    out['start_year'], out['end_year'] = parse_year_span(df['year'])
+    out['year'] = out['start_year']
+    out['parentalguide'] = parental_guide(df['certificate'])
+    return out[SERIES_COLUMNS]
+
+
+DATASETS = {
+    'movie': (clean_movies, 'imdb_movies.csv', 'movie_after_cleaning.csv'),
+    'series': (clean_series, 'imdb_series.csv', 'series_after_cleaning.csv'),
+}
+
+
+def _clean_chunk(kind, chunk):
+    return DATASETS[kind][0](chunk)
+
+
+def run(kind, source=None, target=None, chunksize=100_000, workers=1):
+    """Clean ``source`` into ``target`` chunk by chunk and return ``(rows, seconds)``.
+
+    With ``workers > 1`` chunks are cleaned in a process pool; at most
+    ``2 * workers`` chunks are in flight so memory stays bounded, and results
+    are written in input order.
+    """
+    _, raw, clean = DATASETS[kind]
+    source = source or PATH / raw
+    target = target or PATH / clean
+    start = time.perf_counter()
+    rows = 0
+    first = True
+
+    def write(frame):
+        nonlocal rows, first
+        frame.to_csv(target, mode='w' if first else 'a', header=first, index=False)
+        rows += len(frame)
+        first = False
+
+    reader = pd.read_csv(source, chunksize=chunksize, dtype=str)
+    if workers <= 1:
+        for chunk in reader:
+            write(_clean_chunk(kind, chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in reader:
+                pending.append(pool.submit(_clean_chunk, kind, chunk))
+                if len(pending) >= 2 * workers:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    if first:
+        # Empty input: still produce a file with the header
+        write(DATASETS[kind][0](pd.read_csv(source, nrows=0, dtype=str)))
+    return rows, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--kind', choices=['movie', 'series', 'all'], default='all')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    kinds = list(DATASETS) if args.kind == 'all' else [args.kind]
+    for kind in kinds:
+        rows, seconds = run(kind, chunksize=args.chunksize, workers=args.workers)
+        print(f"{kind}: {rows:,} rows in {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f} rows/s) "
+              f"-> {DATASETS[kind][2]}")
+
+
+if __name__ == '__main__':
+    main()
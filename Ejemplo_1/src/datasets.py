@@ -0,0 +1,109 @@
+"""Lazy, column-pruned access to the IMDb datasets.
+
+Every consumer of the data (the graph tabs, the header constants, the
+recommender...) declares the columns it reads. A dataset only reads those
+columns from disk the first time somebody asks for them, so a worker that
+never serves the series tab or the recommender never holds that data.
+"""
+import threading
+from collections.abc import Mapping
+
+import pandas as pd
+
+
+class LazyFrame:
+    """CSV file whose columns are read on first use and kept afterwards."""
+
+    def __init__(self, path, **read_kwargs):
+        self.path = path
+        self.read_kwargs = read_kwargs
+        self._frame = None
+        self._header = None
+        self._lock = threading.Lock()
+
+    @property
+    def header(self):
+        """Column names of the file, in file order."""
+        if self._header is None:
+            self._header = list(pd.read_csv(self.path, nrows=0, **self.read_kwargs).columns)
+        return self._header
+
+    @property
+    def loaded_columns(self):
+        return [] if self._frame is None else list(self._frame.columns)
+
+    def load(self, columns=None):
+        """Return a frame with ``columns`` (all of them when None), reading only the missing ones."""
+        columns = self.header if columns is None else list(columns)
+        with self._lock:
+            missing = [c for c in columns if c not in self.loaded_columns]
+            if missing:
+                part = pd.read_csv(self.path, usecols=missing, **self.read_kwargs)
+                self._frame = part if self._frame is None else self._frame.join(part)
+            return self._frame[columns]
+
+
+class LazyWorkbook(Mapping):
+    """Excel workbook that behaves like ``pd.read_excel(sheet_name=None)`` but reads sheets on demand."""
+
+    def __init__(self, path, **read_kwargs):
+        self.path = path
+        self.read_kwargs = read_kwargs
+        self._sheets = {}
+        self._names = None
+        self._lock = threading.Lock()
+
+    @property
+    def sheet_names(self):
+        if self._names is None:
+            with pd.ExcelFile(self.path) as book:
+                self._names = list(book.sheet_names)
+        return self._names
+
+    def __getitem__(self, name):
+        if name not in self.sheet_names:
+            raise KeyError(name)
+        with self._lock:
+            if name not in self._sheets:
+                self._sheets[name] = pd.read_excel(self.path, sheet_name=name, **self.read_kwargs)
+            return self._sheets[name]
+
+    def __iter__(self):
+        return iter(self.sheet_names)
+
+    def __len__(self):
+        return len(self.sheet_names)
+
+
+class DatasetRegistry:
+    """Named datasets plus the columns each consumer declared for them."""
+
+    def __init__(self):
+        self._frames = {}
+        self._splits = {}
+        self._consumers = {}
+
+    def register(self, name, frame, splits=None):
+        self._frames[name] = frame
+        self._splits[name] = splits
+
+    def declare(self, consumer, **columns):
+        """Declare the columns ``consumer`` reads, per dataset: ``declare('links', movie=[...])``."""
+        self._consumers.setdefault(consumer, {}).update(columns)
+
+    def columns(self, name, consumer):
+        try:
+            return self._consumers[consumer][name]
+        except KeyError:
+            raise KeyError(f"'{consumer}' declared no columns for dataset '{name}'") from None
+
+    def frame(self, name, consumer):
+        """Frame of dataset ``name`` restricted to what ``consumer`` declared."""
+        return self._frames[name].load(self.columns(name, consumer))
+
+    def splits(self, name):
+        return self._splits[name]
+
+    def loaded(self):
+        """Columns currently resident per dataset, for diagnostics."""
+        return {name: frame.loaded_columns for name, frame in self._frames.items()}
@@ -0,0 +1,59 @@
+"""Inverted index over the comma-joined, multi-valued columns.
+
+Columns such as ``genre`` or ``country`` hold values like "Crime,Drama".
+They are split once, when the index is built, into a sparse one-hot matrix
+per field (rows = titles, columns = facet values). Filtering and counting
+are then sparse matrix operations: "titles per genre within country X" is
+``genre.T @ country[:, X]``.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+FACETS = ['genre', 'country', 'language', 'stars', 'production_company']
+
+
+class FacetIndex:
+    """Sparse title x value matrices for each multi-valued field of ``df``."""
+
+    def __init__(self, df, fields=FACETS):
+        self.n_rows = len(df)
+        self.matrices = {}
+        self.values = {}
+        for field in fields:
+            exploded = df[field].reset_index(drop=True).str.split(',').explode().str.strip()
+            exploded = exploded[exploded.notna() & (exploded != '')]
+            codes, uniques = pd.factorize(exploded)
+            matrix = sparse.csr_matrix(
+                (np.ones(len(codes), dtype=np.int32), (exploded.index.to_numpy(), codes)),
+                shape=(self.n_rows, len(uniques)),
+            )
+            # A value repeated within one cell still counts once
+            matrix.data[:] = 1
+            # Most frequent values first, which is also the order of the dropdowns
+            order = np.argsort(-np.asarray(matrix.sum(axis=0)).ravel(), kind='stable')
+            self.matrices[field] = matrix[:, order].tocsc()
+            self.values[field] = pd.Index(uniques[order])
+
+    def options(self, field):
+        return [{'label': v, 'value': v} for v in self.values[field]]
+
+    def mask(self, filters):
+        """Rows matching every field in ``filters`` ({field: [values]}), any value within a field."""
+        mask = np.ones(self.n_rows, dtype=bool)
+        for field, selected in filters.items():
+            if not selected:
+                continue
+            columns = self.values[field].get_indexer(selected)
+            columns = columns[columns >= 0]
+            mask &= np.asarray(self.matrices[field][:, columns].sum(axis=1)).ravel() > 0
+        return mask
+
+    def counts(self, field, mask=None):
+        """Number of titles per value of ``field``, restricted to ``mask``, most frequent first."""
+        matrix = self.matrices[field]
+        if mask is None:
+            totals = np.asarray(matrix.sum(axis=0)).ravel()
+        else:
+            totals = matrix.T @ mask.astype(np.int32)
+        return pd.Series(totals, index=self.values[field]).sort_values(ascending=False, kind='stable')
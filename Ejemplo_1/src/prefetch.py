@@ -0,0 +1,66 @@
+"""Speculative background computation of the graph tabs.
+
+When a tab is served for a dataset, the figures of the other tabs of that
+dataset are computed in a small thread pool so the next tab switch is
+answered from memory. Prefetching never gets in the way of a foreground
+request: at most ``max_pending`` jobs are queued or running on
+``max_workers`` threads, and a foreground request for a tab whose job has
+not started yet cancels it and computes the figures itself instead of
+waiting behind other jobs.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class FigurePrefetcher:
+    """Figures per (tab, dataset), built by ``builders[tab](dataset)``."""
+
+    def __init__(self, builders, max_workers=1, max_pending=3):
+        self.builders = builders
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def get(self, tab, dataset):
+        key = (tab, dataset)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and future.cancel():
+                # Still queued behind other prefetch jobs: do it in the foreground
+                del self._futures[key]
+                future = None
+
+        figures = None
+        if future is not None:
+            try:
+                figures = future.result()
+            except Exception:
+                with self._lock:
+                    self._futures.pop(key, None)
+        if figures is None:
+            figures = self.builders[tab](dataset)
+            done = Future()
+            done.set_result(figures)
+            with self._lock:
+                self._futures[key] = done
+
+        self.prefetch(dataset, exclude=tab)
+        return figures
+
+    def prefetch(self, dataset, exclude=None):
+        with self._lock:
+            pending = sum(not f.done() for f in self._futures.values())
+            for tab in self.builders:
+                key = (tab, dataset)
+                if tab == exclude or key in self._futures:
+                    continue
+                if pending >= self.max_pending:
+                    break
+                self._futures[key] = self._pool.submit(self.builders[tab], dataset)
+                pending += 1
+
+    def cached(self):
+        """Keys whose figures are ready, for diagnostics."""
+        with self._lock:
+            return [key for key, f in self._futures.items() if f.done() and not f.cancelled() and f.exception() is None]
@@ -0,0 +1,85 @@
+"""Content-based recommender shared by the Dash callbacks and the HTTP API.
+
+The TF-IDF matrix is fitted once per dataset, on first use, instead of on
+every dropdown change. Rows are L2-normalised by the vectorizer, so the
+dot product of two rows is their cosine similarity.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+def top_k(scores, rows, k):
+    """Column indices and scores of the ``k`` best matches per row of ``scores``.
+
+    ``rows[i]`` is the catalog row the i-th query came from; a title is never
+    its own recommendation. ``scores`` is modified in place.
+    """
+    k = min(k, scores.shape[1] - 1)
+    if k <= 0:
+        empty = np.empty((len(rows), 0))
+        return empty.astype(np.intp), empty
+    scores[np.arange(len(rows)), rows] = -np.inf
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    # Highest score first, ties in catalog order like the original sorted() call
+    order = np.lexsort((top, -top_scores), axis=1)
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+class Recommender:
+    """TF-IDF recommender over the text ``fields`` of the frame returned by ``load``."""
+
+    def __init__(self, load, fields):
+        self.load = load
+        self.fields = fields
+        self._df = None
+        self._tfidf_matrix = None
+        self._indices = None
+        self._lock = threading.Lock()
+
+    def fit(self):
+        with self._lock:
+            if self._tfidf_matrix is None:
+                df = self.load().reset_index(drop=True)
+                # Same word cloud as the original callbacks: a missing field blanks the whole text
+                word_cloud = df[self.fields[0]]
+                for field in self.fields[1:]:
+                    word_cloud = word_cloud + " " + df[field]
+                tfidf = TfidfVectorizer(stop_words='english')
+                self._tfidf_matrix = tfidf.fit_transform(word_cloud.fillna('')).tocsr()
+                self._indices = pd.Series(df.index, index=df['title'])
+                self._indices = self._indices[~self._indices.index.duplicated()]
+                self._df = df
+        return self
+
+    def __contains__(self, title):
+        return title in self.fit()._indices.index
+
+    def scores(self, titles):
+        """Similarity of every title in ``titles`` against the whole catalog, as one sparse product."""
+        self.fit()
+        rows = self._indices[titles].to_numpy()
+        return rows, (self._tfidf_matrix[rows] @ self._tfidf_matrix.T).toarray()
+
+    def recommend(self, titles, k=5):
+        """Top-``k`` recommendations for each title, as lists of ``{'title', 'link', 'score'}`` dicts.
+
+        Titles that are not in the catalog are skipped; check with ``in`` beforehand.
+        """
+        titles = [t for t in titles if t in self]
+        if not titles:
+            return {}
+        rows, scores = self.scores(titles)
+        top, top_scores = top_k(scores, rows, k)
+
+        result = {}
+        for title, picks, picked_scores in zip(titles, top, top_scores):
+            picked = self._df.iloc[picks]
+            result[title] = [
+                {'title': t, 'link': link, 'score': float(score)}
+                for t, link, score in zip(picked['title'], picked['link'], picked_scores)
+            ]
+        return result
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from carga import cargar_ventas
+
+
+class AlmacenParticionado:
+    """
+    Ventas guardadas en Parquet con particiones estilo Hive por región y mes:
+
+        raiz/Región=Sur/mes=2024-06/part-0.parquet
+
+    Las consultas traducen sus filtros a expresiones sobre las columnas de partición,
+    de modo que pyarrow solo abre los archivos de las regiones y meses que tocan
+    (predicate pushdown). Los datos viven en disco, no en memoria.
+    """
+
+    ESQUEMA_PARTICION = pa.schema([('Región', pa.string()), ('mes', pa.string())])
+
+    def __init__(self, raiz):
+        self.raiz = raiz
+        self.dataset = ds.dataset(
+            raiz, format='parquet',
+            partitioning=ds.partitioning(self.ESQUEMA_PARTICION, flavor='hive')
+        )
+
+    @classmethod
+    def desde_csv(cls, ruta_csv, raiz, encoding='utf-8'):
+        """
+        Abre el almacén de 'ruta_csv', (re)escribiéndolo solo si el CSV cambió desde
+        la última vez (tamaño o fecha de modificación).
+        """
+        info = os.stat(ruta_csv)
+        firma = {'csv': os.path.abspath(ruta_csv), 'tamano': info.st_size, 'mtime_ns': info.st_mtime_ns}
+        ruta_firma = os.path.join(raiz, '_firma.json')
+        if os.path.exists(ruta_firma):
+            with open(ruta_firma, encoding='utf-8') as f:
+                if json.load(f) == firma:
+                    return cls(raiz)
+        cls.escribir(cargar_ventas(ruta_csv, encoding=encoding), raiz)
+        with open(ruta_firma, 'w', encoding='utf-8') as f:
+            json.dump(firma, f)
+        return cls(raiz)
+
+    @staticmethod
+    def _tabla(df):
+        """Tabla de Arrow de 'df' con las columnas de partición (Región y mes)."""
+        return pa.Table.from_pandas(df.assign(
+            Región=df['Región'].astype(str),
+            mes=df['Fecha'].dt.strftime('%Y-%m')
+        ), preserve_index=False)
+
+    @staticmethod
+    def _escribir_tabla(tabla, raiz, **kwargs):
+        ds.write_dataset(
+            tabla, raiz, format='parquet',
+            partitioning=ds.partitioning(AlmacenParticionado.ESQUEMA_PARTICION, flavor='hive'),
+            existing_data_behavior='overwrite_or_ignore', **kwargs
+        )
+
+    @staticmethod
+    def escribir(df, raiz):
+        """Escribe 'df' particionado por Región y mes de 'Fecha', reemplazando lo que hubiera."""
+        if os.path.exists(raiz):
+            shutil.rmtree(raiz)
+        AlmacenParticionado._escribir_tabla(AlmacenParticionado._tabla(df), raiz)
+
+    def anadir(self, df):
+        """
+        Añade las filas de 'df' en archivos nuevos de sus particiones, sin reescribir los
+        existentes, con los mismos tipos que el resto del almacén.
+        """
+        esquema = self.dataset.schema
+        tabla = self._tabla(df).select(esquema.names).cast(esquema)
+        self._escribir_tabla(tabla, self.raiz, basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet')
+        self.dataset = ds.dataset(
+            self.raiz, format='parquet',
+            partitioning=ds.partitioning(self.ESQUEMA_PARTICION, flavor='hive')
+        )
+
+    def regiones(self):
+        """Regiones presentes, leídas de los nombres de las particiones (sin abrir archivos)."""
+        return sorted({
+            ds.get_partition_keys(fragmento.partition_expression)['Región']
+            for fragmento in self.dataset.get_fragments()
+        })
+
+    def leer(self, region=None, inicio=None, fin=None, columnas=None):
+        """
+        Filas de 'region' con Fecha entre 'inicio' y 'fin' (ambos opcionales). Solo se
+        leen las particiones de esa región y de los meses del intervalo.
+        """
+        filtro = None
+
+        def y(expresion):
+            return expresion if filtro is None else filtro & expresion
+
+        if region is not None:
+            filtro = y(ds.field('Región') == region)
+        if inicio is not None:
+            inicio = pd.Timestamp(inicio).as_unit('ns')
+            filtro = y(ds.field('mes') >= inicio.strftime('%Y-%m'))
+            filtro = y(ds.field('Fecha') >= pa.scalar(inicio.to_datetime64(), pa.timestamp('ns')))
+        if fin is not None:
+            fin = pd.Timestamp(fin).as_unit('ns')
+            filtro = y(ds.field('mes') <= fin.strftime('%Y-%m'))
+            filtro = y(ds.field('Fecha') <= pa.scalar(fin.to_datetime64(), pa.timestamp('ns')))
+        tabla = self.dataset.to_table(columns=columnas, filter=filtro)
+        return tabla.to_pandas()
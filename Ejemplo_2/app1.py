@@ -1,18 +1,58 @@
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
-import plotly.express as px
-import pandas as pd
+from dash.dependencies import Input, Output, State
+import os
+import figuras
+from cubo import CuboVentas
+from ingesta import IngestorIncremental
 
 # --- 1. Carga y Preparación de Datos ---
 
+# Motor de consultas de los KPIs y gráficos:
+#   'cubo':   sumas por (Departamento, Producto) en memoria (comportamiento por defecto)
+#   'duckdb': SQL sobre el archivo con DuckDB embebido, para tablas que no caben en memoria;
+#             VENTAS_ARCHIVO puede apuntar a un .parquet con las mismas columnas
+MOTOR_CONSULTAS = os.environ.get('VENTAS_MOTOR', 'cubo')
+ARCHIVO_VENTAS = os.environ.get('VENTAS_ARCHIVO', 'ventas_agricolas_sinteticas.csv')
+
 # Cargar los datos de ventas
-try:
-    df = pd.read_csv('ventas_agricolas_sinteticas.csv')
-except FileNotFoundError:
-    print("Error: Asegúrate de que 'ventas_agricolas_sinteticas.csv' esté en la misma carpeta que el script.")
+if not os.path.exists(ARCHIVO_VENTAS):
+    print(f"Error: Asegúrate de que '{ARCHIVO_VENTAS}' esté en la misma carpeta que el script.")
     exit()
 
+# Cada cuánto se buscan filas nuevas en el CSV
+INTERVALO_INGESTA_MS = 10 * 1000
+
+if MOTOR_CONSULTAS == 'duckdb':
+    from consultas import ConsultasDuckDB
+
+    # Cada consulta lee el archivo directamente: las filas nuevas ya aparecen sin ingestor
+    cubo = ConsultasDuckDB(ARCHIVO_VENTAS)
+
+    def version_datos():
+        """Cambia cuando cambia el archivo (tamaño o fecha de modificación)."""
+        info = os.stat(ARCHIVO_VENTAS)
+        return f"{info.st_size}-{info.st_mtime_ns}"
+else:
+    # El archivo crece durante el día: el ingestor solo lee las filas añadidas desde la
+    # última vez y mantiene las sumas por (Departamento, Producto)
+    ingestor = IngestorIncremental(
+        ARCHIVO_VENTAS,
+        dimensiones=[('Departamento', 'Producto')],
+        columnas_suma=['Ventas_Totales', 'Cantidad_KG']
+    )
+    ingestor.leer_nuevas()
+
+    # Cubo de sumas por (Departamento, Producto): los callbacks solo recortan y suman el cubo
+    cubo = CuboVentas.desde_agregado(ingestor.agregado(('Departamento', 'Producto')))
+
+    def version_datos():
+        """Incorpora las filas nuevas del CSV (si las hay) y devuelve la versión vigente."""
+        global cubo
+        if ingestor.leer_nuevas():
+            cubo = CuboVentas.desde_agregado(ingestor.agregado(('Departamento', 'Producto')))
+        return ingestor.version
+
 # --- 2. Definición de Estilos ---
 colors = {
     'background': '#F9F9F9',
@@ -51,14 +91,14 @@ app.layout = html.Div(style={'backgroundColor': colors['background'], 'fontFamil
                 html.H4("Filtros", style={'marginTop': '0', 'textAlign': 'center'}),
                 dcc.Dropdown(
                     id='filtro-departamento',
-                    options=[{'label': 'Todos los Departamentos', 'value': 'all'}] + [{'label': i, 'value': i} for i in sorted(df['Departamento'].unique())],
+                    options=[{'label': 'Todos los Departamentos', 'value': 'all'}] + [{'label': i, 'value': i} for i in cubo.departamentos],
                     value='all',
                     clearable=False
                 ),
                 html.Br(),
                 dcc.Dropdown(
                     id='filtro-producto',
-                    options=[{'label': 'Todos los Productos', 'value': 'all'}] + [{'label': i, 'value': i} for i in sorted(df['Producto'].unique())],
+                    options=[{'label': 'Todos los Productos', 'value': 'all'}] + [{'label': i, 'value': i} for i in cubo.productos],
                     value='all',
                     clearable=False
                 ),
@@ -72,9 +112,37 @@ app.layout = html.Div(style={'backgroundColor': colors['background'], 'fontFamil
             dcc.Graph(id='bar-ventas-producto', style={'flex': 1}),
         ]),
     ]),
+
+    # Refresco con las ventas añadidas al CSV; la versión guardada es la última que vio esta sesión
+    dcc.Interval(id='intervalo-ingesta', interval=INTERVALO_INGESTA_MS, n_intervals=0),
+    dcc.Store(id='version-ingesta'),
 ])
 
 # --- 5. Callbacks para la Interactividad ---
+def opciones(todos, valores):
+    """Opciones de un filtro: 'todos' (valor 'all') seguido de cada valor."""
+    return [{'label': todos, 'value': 'all'}] + [{'label': i, 'value': i} for i in valores]
+
+@app.callback(
+    [Output('version-ingesta', 'data'),
+     Output('filtro-departamento', 'options'),
+     Output('filtro-producto', 'options')],
+    [Input('intervalo-ingesta', 'n_intervals')],
+    [State('version-ingesta', 'data')]
+)
+def actualizar_version(n_intervals, version_vista):
+    """
+    Busca filas nuevas en el archivo. Solo si hay datos que esta sesión todavía no ha
+    visto se guarda la versión nueva (lo que redibuja KPIs y gráficos) y se actualizan
+    las opciones de los filtros, por si aparecieron departamentos o productos nuevos.
+    """
+    version = version_datos()
+    if version_vista == version:
+        return dash.no_update, dash.no_update, dash.no_update
+    return (version,
+            opciones('Todos los Departamentos', cubo.departamentos),
+            opciones('Todos los Productos', cubo.productos))
+
 @app.callback(
     [Output('kpi-ventas', 'children'),
      Output('kpi-cantidad', 'children'),
@@ -83,18 +151,12 @@ app.layout = html.Div(style={'backgroundColor': colors['background'], 'fontFamil
      Output('bar-ventas-departamento', 'figure'),
      Output('bar-ventas-producto', 'figure')],
     [Input('filtro-departamento', 'value'),
-     Input('filtro-producto', 'value')]
+     Input('filtro-producto', 'value'),
+     Input('version-ingesta', 'data')]
 )
-def actualizar_dashboard(depto_seleccionado, producto_seleccionado):
-    dff = df.copy()
-    if depto_seleccionado != 'all':
-        dff = dff[dff['Departamento'] == depto_seleccionado]
-    if producto_seleccionado != 'all':
-        dff = dff[dff['Producto'] == producto_seleccionado]
-
+def actualizar_dashboard(depto_seleccionado, producto_seleccionado, version=None):
     # --- Calcular KPIs ---
-    total_ventas = dff['Ventas_Totales'].sum()
-    total_cantidad = dff['Cantidad_KG'].sum()
+    total_ventas, total_cantidad = cubo.totales(depto_seleccionado, producto_seleccionado)
     precio_promedio = total_ventas / total_cantidad if total_cantidad > 0 else 0
     
     kpi_ventas_layout = [html.H4("Ventas Totales"), html.H3(f"${total_ventas:,.0f}")]
@@ -102,10 +164,11 @@ def actualizar_dashboard(depto_seleccionado, producto_seleccionado):
     kpi_precio_promedio_layout = [html.H4("Precio Promedio/KG"), html.H3(f"${precio_promedio:,.2f}")]
 
     # --- Generar Gráficos ---
+    # figuras.barras devuelve el mismo diccionario que px.bar sin construir la figura de Plotly
 
     # Gráfico de Barras: Ventas por Departamento
-    ventas_por_depto = dff.groupby('Departamento')['Ventas_Totales'].sum().reset_index().sort_values('Ventas_Totales', ascending=False)
-    fig_bar_depto = px.bar(
+    ventas_por_depto = cubo.ventas_por('Departamento', depto_seleccionado, producto_seleccionado)
+    fig_bar_depto = figuras.barras(
         ventas_por_depto,
         x='Departamento',
         y='Ventas_Totales',
@@ -113,20 +176,14 @@ def actualizar_dashboard(depto_seleccionado, producto_seleccionado):
         labels={'Ventas_Totales': 'Ventas Totales (COP)', 'Departamento': 'Departamento'},
         text='Ventas_Totales'
     )
-    fig_bar_depto.update_traces(
-        marker_color=colors['accent'],
-        texttemplate='$%{text:,.0s}',
-        textposition='outside'
-    )
-    fig_bar_depto.update_layout(
-        title_x=0.5,
-        plot_bgcolor=colors['card_bg'],
-        paper_bgcolor=colors['card_bg']
-    )
+    fig_bar_depto['data'][0]['marker']['color'] = colors['accent']
+    fig_bar_depto['data'][0].update(texttemplate='$%{text:,.0s}', textposition='outside')
+    fig_bar_depto['layout']['title']['x'] = 0.5
+    fig_bar_depto['layout'].update(plot_bgcolor=colors['card_bg'], paper_bgcolor=colors['card_bg'])
     
     # Gráfico de Barras: Ventas por Producto
-    ventas_por_prod = dff.groupby('Producto')['Ventas_Totales'].sum().reset_index().sort_values('Ventas_Totales', ascending=False)
-    fig_bar_prod = px.bar(
+    ventas_por_prod = cubo.ventas_por('Producto', depto_seleccionado, producto_seleccionado)
+    fig_bar_prod = figuras.barras(
         ventas_por_prod,
         x='Producto',
         y='Ventas_Totales',
@@ -134,16 +191,10 @@ def actualizar_dashboard(depto_seleccionado, producto_seleccionado):
         labels={'Ventas_Totales': 'Ventas Totales (COP)', 'Producto': 'Producto'},
         text='Ventas_Totales'
     )
-    fig_bar_prod.update_traces(
-        marker_color='#5DADE2', # Un color azul para diferenciar
-        texttemplate='$%{text:,.0s}',
-        textposition='outside'
-    )
-    fig_bar_prod.update_layout(
-        title_x=0.5,
-        plot_bgcolor=colors['card_bg'],
-        paper_bgcolor=colors['card_bg']
-    )
+    fig_bar_prod['data'][0]['marker']['color'] = '#5DADE2' # Un color azul para diferenciar
+    fig_bar_prod['data'][0].update(texttemplate='$%{text:,.0s}', textposition='outside')
+    fig_bar_prod['layout']['title']['x'] = 0.5
+    fig_bar_prod['layout'].update(plot_bgcolor=colors['card_bg'], paper_bgcolor=colors['card_bg'])
 
     return kpi_ventas_layout, kpi_cantidad_layout, kpi_precio_promedio_layout, fig_bar_depto, fig_bar_prod
 
@@ -1,14 +1,17 @@
 # 1. IMPORTAR LIBRERÍAS NECESARIAS
 import pandas as pd
-import plotly.express as px
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
+import figuras
+from dispersion import figura_dispersion
+from carga import cargar_ventas
 
 # 2. CARGAR LOS DATOS DESDE EL ARCHIVO CSV
 # Asegúrate de que el archivo 'ventas_agricolas_sinteticas.csv' esté en la misma carpeta.
+# Se carga con tipos declarados (categóricas y enteros reducidos) y caché binaria.
 try:
-    df = pd.read_csv("ventas_agricolas_sinteticas.csv")
+    df = cargar_ventas("ventas_agricolas_sinteticas.csv")
 except FileNotFoundError:
     print("Error: El archivo 'ventas_agricolas_sinteticas.csv' no fue encontrado.")
     # Creamos un DataFrame vacío para que la aplicación no falle al iniciar.
@@ -43,6 +46,17 @@ app.layout = html.Div(children=[
             value=df['Departamento'].unique().tolist(),  # Selecciona todos por defecto
             multi=True,  # Permite selección múltiple
             placeholder="Selecciona uno o varios departamentos"
+        ),
+        # Con muchas ventas el gráfico de dispersión no envía los puntos crudos
+        html.Label('Con muchos datos, el gráfico de dispersión muestra:', style={'fontWeight': 'bold', 'marginTop': '10px'}),
+        dcc.RadioItems(
+            id='modo-dispersion',
+            options=[
+                {'label': ' Una muestra que preserva la densidad', 'value': 'muestra'},
+                {'label': ' Agregados por celdas', 'value': 'celdas'}
+            ],
+            value='muestra',
+            inline=True
         )
     ], style={'padding': '10px 20px'}),
 
@@ -69,9 +83,10 @@ app.layout = html.Div(children=[
     [Output('grafico-ventas-producto', 'figure'),
      Output('grafico-precio-cantidad', 'figure'),
      Output('grafico-ventas-departamento', 'figure')],
-    [Input('filtro-departamento', 'value')]
+    [Input('filtro-departamento', 'value'),
+     Input('modo-dispersion', 'value')]
 )
-def actualizar_graficos(departamentos_seleccionados):
+def actualizar_graficos(departamentos_seleccionados, modo_dispersion):
     # Si no se selecciona ningún departamento, usar el DataFrame completo
     if not departamentos_seleccionados:
         filtered_df = df
@@ -80,9 +95,10 @@ def actualizar_graficos(departamentos_seleccionados):
         filtered_df = df[df['Departamento'].isin(departamentos_seleccionados)]
 
     # 1. GRÁFICO DE BARRAS: VENTAS TOTALES POR PRODUCTO
-    # Agrupamos por producto y sumamos las ventas para tener un total consolidado
-    ventas_por_producto = filtered_df.groupby('Producto')['Ventas_Totales'].sum().reset_index()
-    fig_barras = px.bar(
+    # Agrupamos por producto y sumamos las ventas para tener un total consolidado.
+    # Las figuras se arman como diccionarios (figuras.py), equivalentes a los de plotly.express
+    ventas_por_producto = filtered_df.groupby('Producto', observed=True)['Ventas_Totales'].sum().reset_index()
+    fig_barras = figuras.barras(
         ventas_por_producto,
         x='Producto',
         y='Ventas_Totales',
@@ -91,11 +107,13 @@ def actualizar_graficos(departamentos_seleccionados):
         color='Producto',
         template='plotly_white'
     )
-    fig_barras.update_layout(title_x=0.5) # Centrar título
+    fig_barras['layout']['title']['x'] = 0.5 # Centrar título
 
     # 2. GRÁFICO DE DISPERSIÓN: PRECIO VS. CANTIDAD
-    fig_dispersion = px.scatter(
+    # Pasa a WebGL y, con cientos de miles de filas, a una muestra o agregados por celdas
+    fig_dispersion = figura_dispersion(
         filtered_df,
+        modo_reduccion=modo_dispersion,
         x='Cantidad_KG',
         y='Precio_KG',
         size='Ventas_Totales',  # El tamaño de la burbuja representa las ventas
@@ -105,18 +123,18 @@ def actualizar_graficos(departamentos_seleccionados):
         labels={'Cantidad_KG': 'Cantidad Vendida (KG)', 'Precio_KG': 'Precio por KG (COP)'},
         template='plotly_white'
     )
-    fig_dispersion.update_layout(title_x=0.5) # Centrar título
+    fig_dispersion['layout']['title']['x'] = 0.5 # Centrar título
     
     # 3. GRÁFICO DE PIE: DISTRIBUCIÓN DE VENTAS POR DEPARTAMENTO
-    ventas_por_departamento = filtered_df.groupby('Departamento')['Ventas_Totales'].sum().reset_index()
-    fig_pie = px.pie(
+    ventas_por_departamento = filtered_df.groupby('Departamento', observed=True)['Ventas_Totales'].sum().reset_index()
+    fig_pie = figuras.pastel(
         ventas_por_departamento,
         names='Departamento',
         values='Ventas_Totales',
         title='Distribución de Ventas por Departamento',
         hole=0.3 # Estilo dona
     )
-    fig_pie.update_layout(title_x=0.5)
+    fig_pie['layout']['title']['x'] = 0.5
 
     return fig_barras, fig_dispersion, fig_pie
 
@@ -1,9 +1,16 @@
 import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash import dcc, html, ctx
+from dash.dependencies import Input, Output, State
 import plotly.express as px
 import pandas as pd
 import os
+import sys
+from series_tiempo import SerieMultiResolucion
+from ingesta import IngestorIncremental
+from carga import cargar_ventas
+# Módulos compartidos entre ejemplos (carpeta comun/ en la raíz del repositorio)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.precalculo import FigurasPrecalculadas
 
 # --- 1. Crear un archivo CSV de ejemplo (si no existe) ---
 # En un escenario real, ya tendrías tu archivo "datos_ventas.csv".
@@ -24,38 +31,90 @@ if not os.path.exists(csv_file_path):
     df_ejemplo.to_csv(csv_file_path, index=False, encoding='utf-8')
 
 # --- 2. Cargar y procesar los datos ---
-# Se especifica la codificación utf-8 para leer correctamente caracteres como 'í' o 'ó'.
-try:
-    df = pd.read_csv(csv_file_path, encoding='utf-8')
-except Exception as e:
-    print(f"Error al leer el archivo CSV: {e}")
-    # Si falla, intenta con otra codificación común en Windows
-    df = pd.read_csv(csv_file_path, encoding='latin1')
+# Modo de almacenamiento de las transacciones:
+#   'memoria': el CSV entero se carga en un DataFrame (comportamiento por defecto)
+#   'parquet': se escribe en Parquet particionado por Región y mes y solo se leen del disco
+#              las particiones que toca cada consulta; en memoria quedan los acumulados
+MODO_ALMACEN = os.environ.get('VENTAS_ALMACEN', 'memoria')
+DIRECTORIO_ALMACEN = os.path.join('.cache', 'datos_ventas_parquet')
 
-# Convertir la columna 'Fecha' a tipo datetime para un manejo adecuado de las fechas
-df['Fecha'] = pd.to_datetime(df['Fecha'])
+if MODO_ALMACEN == 'parquet':
+    from almacen import AlmacenParticionado
+
+    # Se reescribe solo si el CSV cambió desde la última vez
+    almacen = AlmacenParticionado.desde_csv(csv_file_path, DIRECTORIO_ALMACEN, encoding='utf-8')
+    regiones = almacen.regiones()
+
+    def leer_transacciones(region, inicio, fin):
+        return almacen.leer(region, inicio, fin, columnas=['Fecha', 'Ventas'])
+
+    # Los acumulados se calculan con una sola lectura de las columnas necesarias;
+    # las transacciones se piden al almacén cuando el zoom es lo bastante cercano
+    serie_ventas = SerieMultiResolucion(
+        almacen.leer(columnas=['Fecha', 'Región', 'Ventas']),
+        fecha='Fecha', grupo='Región', valor='Ventas', leer_transacciones=leer_transacciones
+    )
+else:
+    # Se especifica la codificación utf-8 para leer correctamente caracteres como 'í' o 'ó'.
+    # cargar_ventas aplica el esquema declarado (categóricas, números reducidos y 'Fecha' como
+    # datetime, parseada una sola vez) y guarda el resultado en una caché binaria.
+    try:
+        df = cargar_ventas(csv_file_path, encoding='utf-8')
+    except Exception as e:
+        print(f"Error al leer el archivo CSV: {e}")
+        # Si falla, intenta con otra codificación común en Windows
+        df = cargar_ventas(csv_file_path, encoding='latin1')
+    regiones = list(df['Región'].unique())
+
+    # Acumulados diarios, semanales y mensuales por región, calculados una sola vez
+    serie_ventas = SerieMultiResolucion(df, fecha='Fecha', grupo='Región', valor='Ventas')
+
+# Puntos máximos que se envían al gráfico de líneas (aprox. su ancho en píxeles)
+ANCHO_GRAFICO_PX = 1000
+
+
+# El CSV crece durante el día: el ingestor lee solo las filas añadidas y mantiene las
+# sumas de ventas por Categoría y por Región, que alimentan los gráficos estáticos
+ingestor = IngestorIncremental(csv_file_path, dimensiones=['Categoría', 'Región'], columnas_suma=['Ventas'])
+ingestor.leer_nuevas()
+
+
+def incorporar_filas(nuevas):
+    """Añade las filas nuevas del CSV a la serie del gráfico de líneas (y al almacén Parquet)."""
+    nuevas = nuevas.assign(Fecha=pd.to_datetime(nuevas['Fecha'], format='ISO8601'))
+    if MODO_ALMACEN == 'parquet':
+        almacen.anadir(nuevas)
+    serie_ventas.agregar(nuevas)
+
+# Las filas de la primera lectura ya están en serie_ventas: solo se incorporan las siguientes
+ingestor.al_leer = incorporar_filas
+
+# Cada cuánto se buscan filas nuevas en el CSV
+INTERVALO_INGESTA_MS = 10 * 1000
 
 
 # --- 3. Crear figuras de Plotly ---
 # Gráfico de barras: Ventas totales por Categoría
-fig_bar_ventas_categoria = px.bar(
-    df.groupby('Categoría')['Ventas'].sum().reset_index(),
-    x='Categoría',
-    y='Ventas',
-    title='Ventas Totales por Categoría 📊',
-    labels={'Ventas': 'Total de Ventas ($)', 'Categoría': 'Categoría de Producto'},
-    template='plotly_white'
-)
+def crear_fig_bar_ventas_categoria():
+    return px.bar(
+        ingestor.agregado('Categoría')['Ventas'].reset_index(),
+        x='Categoría',
+        y='Ventas',
+        title='Ventas Totales por Categoría 📊',
+        labels={'Ventas': 'Total de Ventas ($)', 'Categoría': 'Categoría de Producto'},
+        template='plotly_white'
+    )
 
 # Gráfico de pastel: Distribución de ventas por Región
-fig_pie_ventas_region = px.pie(
-    df,
-    names='Región',
-    values='Ventas',
-    title='Distribución de Ventas por Región 🌎',
-    hole=0.3, # Crea un gráfico de dona
-    template='plotly_white'
-)
+def crear_fig_pie_ventas_region():
+    return px.pie(
+        ingestor.agregado('Región')['Ventas'].reset_index(),
+        names='Región',
+        values='Ventas',
+        title='Distribución de Ventas por Región 🌎',
+        hole=0.3, # Crea un gráfico de dona
+        template='plotly_white'
+    )
 
 
 # --- 4. Inicializar la aplicación Dash ---
@@ -75,12 +134,12 @@ app.layout = html.Div(
         # Contenedor para los gráficos estáticos (lado a lado)
         html.Div(className='row', children=[
             html.Div(
-                dcc.Graph(figure=fig_bar_ventas_categoria),
+                dcc.Graph(id='grafico-ventas-categoria'),
                 className='six columns',
                 style={'display': 'inline-block', 'width': '49%'}
             ),
             html.Div(
-                dcc.Graph(figure=fig_pie_ventas_region),
+                dcc.Graph(id='grafico-ventas-region'),
                 className='six columns',
                 style={'display': 'inline-block', 'width': '49%'}
             )
@@ -95,50 +154,103 @@ app.layout = html.Div(
             # Menú desplegable para seleccionar la región
             dcc.Dropdown(
                 id='selector-region',
-                options=[{'label': region, 'value': region} for region in df['Región'].unique()],
-                value=df['Región'].unique()[0], # Valor inicial
+                options=[{'label': region, 'value': region} for region in regiones],
+                value=regiones[0], # Valor inicial
                 clearable=False,
                 style={'width': '50%', 'margin': '0 auto'}
             ),
 
             # Gráfico de líneas que se actualizará con el callback
             dcc.Graph(id='grafico-ventas-tiempo')
-        ])
+        ]),
+
+        # Refresco con las filas añadidas al CSV; la versión guardada es la última que vio esta sesión
+        dcc.Interval(id='intervalo-ingesta', interval=INTERVALO_INGESTA_MS, n_intervals=0),
+        dcc.Store(id='version-ingesta')
     ]
 )
 
 
 # --- 6. Definir el Callback para la interactividad ---
 @app.callback(
-    Output('grafico-ventas-tiempo', 'figure'),
-    Input('selector-region', 'value')
+    Output('grafico-ventas-categoria', 'figure'),
+    Output('grafico-ventas-region', 'figure'),
+    Output('version-ingesta', 'data'),
+    Input('intervalo-ingesta', 'n_intervals'),
+    State('version-ingesta', 'data')
 )
-def actualizar_grafico_lineas(region_seleccionada):
+def actualizar_graficos_ingesta(n_intervals, version_vista):
     """
-    Esta función se activa cada vez que el valor del dropdown 'selector-region' cambia.
-    Filtra el DataFrame por la región seleccionada y devuelve un nuevo gráfico de líneas.
+    Incorpora las filas nuevas del CSV y redibuja los gráficos de categoría y región,
+    solo si hay datos que esta sesión todavía no ha visto.
     """
-    # Filtrar el dataframe basado en la región seleccionada
-    df_filtrado = df[df['Región'] == region_seleccionada]
+    ingestor.leer_nuevas()
+    if version_vista == ingestor.version:
+        return dash.no_update, dash.no_update, dash.no_update
+    return crear_fig_bar_ventas_categoria(), crear_fig_pie_ventas_region(), ingestor.version
+
+
+def rango_zoom(relayout_data):
+    """Extrae el rango visible del eje x de 'relayoutData' (None si no hay zoom)."""
+    if not relayout_data or relayout_data.get('xaxis.autorange'):
+        return None, None
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'])
+    return relayout_data.get('xaxis.range[0]'), relayout_data.get('xaxis.range[1]')
+
+
+def crear_fig_lineas(region, inicio=None, fin=None):
+    """Gráfico de líneas de 'region' con la ventana [inicio, fin] en la resolución que cabe."""
+    df_filtrado, resolucion = serie_ventas.ventana(region, inicio, fin, ancho_px=ANCHO_GRAFICO_PX)
 
     # Crear el gráfico de líneas con los datos filtrados
     fig = px.line(
         df_filtrado,
         x='Fecha',
         y='Ventas',
-        title=f'Evolución de Ventas en la Región: {region_seleccionada}',
+        title=f'Evolución de Ventas en la Región: {region} ({resolucion})',
         markers=True, # Muestra puntos en los datos
         labels={'Ventas': 'Ventas ($)', 'Fecha': 'Fecha'},
         template='plotly_white'
     )
     
     fig.update_layout(
-        title_x=0.5 # Centrar el título
+        title_x=0.5, # Centrar el título
+        uirevision=region # Conserva el zoom del usuario al recibir la nueva ventana
     )
+    if inicio is not None and fin is not None:
+        fig.update_xaxes(range=[inicio, fin])
     
     return fig
 
 
+# Las regiones son pocas: la vista completa de cada una se genera al arrancar, ya
+# serializada, y el callback solo la devuelve. Cuando el ingestor incorpora filas
+# nuevas sube su versión y las figuras se regeneran en la siguiente petición.
+figuras_region = FigurasPrecalculadas(crear_fig_lineas)
+figuras_region.precalcular(regiones, ingestor.version)
+
+
+@app.callback(
+    Output('grafico-ventas-tiempo', 'figure'),
+    Input('selector-region', 'value'),
+    Input('grafico-ventas-tiempo', 'relayoutData'),
+    Input('version-ingesta', 'data')
+)
+def actualizar_grafico_lineas(region_seleccionada, relayout_data, version_vista=None):
+    """
+    Esta función se activa cada vez que cambia el dropdown 'selector-region', el zoom del gráfico
+    o llegan filas nuevas al CSV. Solo se envía el intervalo visible, en la resolución
+    (transacciones, diaria, semanal o mensual) que cabe en el ancho del gráfico, reducido con
+    LTTB si hace falta.
+    """
+    # Al cambiar de región se vuelve a la vista completa
+    inicio, fin = (None, None) if ctx.triggered_id == 'selector-region' else rango_zoom(relayout_data)
+    if inicio is None and fin is None:
+        return figuras_region.figura(region_seleccionada, ingestor.version)
+    return crear_fig_lineas(region_seleccionada, inicio, fin)
+
+
 # --- 7. Ejecutar el servidor de la aplicación ---
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
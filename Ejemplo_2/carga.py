@@ -0,0 +1,79 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Módulos compartidos entre ejemplos (carpeta comun/ en la raíz del repositorio)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun import cache
+
+# --- Esquemas declarados de los archivos de ventas ---
+# categoricas: texto con pocos valores distintos -> dtype 'category'
+# enteros / decimales: se reducen al tipo numérico más pequeño que no pierde información
+# fechas: se parsean una sola vez al cargar
+ESQUEMAS = {
+    'ventas_agricolas_sinteticas.csv': {
+        'categoricas': ['Producto', 'Departamento'],
+        'enteros': ['Precio_KG', 'Cantidad_KG', 'Ventas_Totales'],
+        'decimales': [],
+        'fechas': [],
+    },
+    'datos_ventas.csv': {
+        'categoricas': ['Categoría', 'Región'],
+        'enteros': ['Cantidad'],
+        'decimales': ['Ventas', 'Beneficio'],
+        'fechas': ['Fecha'],
+    },
+}
+
+# Cambiar este número invalida todas las cachés (p.ej. si cambia la forma de tipar)
+VERSION_CACHE = 1
+
+
+def _reducir_decimales(serie):
+    """Pasa a float32 solo si no se pierde ningún valor; si no, deja float64."""
+    serie = pd.to_numeric(serie, errors='coerce').astype('float64')
+    reducida = serie.astype('float32')
+    if np.array_equal(reducida.astype('float64').to_numpy(), serie.to_numpy(), equal_nan=True):
+        return reducida
+    return serie
+
+
+def tipar(df, esquema):
+    """Aplica el esquema a un DataFrame recién leído."""
+    for col in esquema['categoricas']:
+        df[col] = df[col].astype('category')
+    for col in esquema['enteros']:
+        numeros = pd.to_numeric(df[col], errors='coerce')
+        df[col] = pd.to_numeric(numeros, downcast='integer') if numeros.notna().all() else numeros
+    for col in esquema['decimales']:
+        df[col] = _reducir_decimales(df[col])
+    for col in esquema['fechas']:
+        df[col] = pd.to_datetime(df[col], format='ISO8601')
+    return df
+
+
+def _firma(ruta, esquema):
+    """Identifica el contenido del CSV y la forma de tiparlo; si cambia, la caché no vale."""
+    info = os.stat(ruta)
+    return (VERSION_CACHE, info.st_size, info.st_mtime_ns, repr(sorted(esquema.items())))
+
+
+def cargar_ventas(ruta, esquema=None, encoding='utf-8', usar_cache=True):
+    """
+    Carga un CSV de ventas con tipos declarados (categóricas, números reducidos y
+    fechas ya parseadas) y guarda el DataFrame tipado en una caché binaria (pickle).
+    Las siguientes cargas leen la caché mientras el CSV no cambie de tamaño ni de
+    fecha de modificación.
+    """
+    esquema = esquema or ESQUEMAS[os.path.basename(ruta)]
+    firma = _firma(ruta, esquema)
+    guardado = cache.leer(ruta, firma) if usar_cache else None
+    if guardado is not None:
+        return guardado['df']
+
+    df = tipar(pd.read_csv(ruta, encoding=encoding), esquema)
+    if usar_cache:
+        cache.guardar(ruta, {'firma': firma, 'df': df})
+    return df
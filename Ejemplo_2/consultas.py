@@ -0,0 +1,103 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+import duckdb
+import pandas as pd
+
+# Consultas parametrizadas: el filtro 'all' se resuelve en SQL ($1 = 'all' deja pasar todo),
+# de modo que una sola sentencia por consulta sirve para cualquier combinación de filtros.
+_FILTRO = "($1 = 'all' OR Departamento = $1) AND ($2 = 'all' OR Producto = $2)"
+
+SENTENCIAS = {
+    'totales': f"""
+        SELECT COALESCE(SUM(Ventas_Totales), 0)::DOUBLE, COALESCE(SUM(Cantidad_KG), 0)::DOUBLE
+        FROM ventas WHERE {_FILTRO}
+    """,
+    'ventas_por_departamento': f"""
+        SELECT Departamento, SUM(Ventas_Totales)::DOUBLE AS Ventas_Totales
+        FROM ventas WHERE {_FILTRO}
+        GROUP BY Departamento ORDER BY Ventas_Totales DESC, Departamento
+    """,
+    'ventas_por_producto': f"""
+        SELECT Producto, SUM(Ventas_Totales)::DOUBLE AS Ventas_Totales
+        FROM ventas WHERE {_FILTRO}
+        GROUP BY Producto ORDER BY Ventas_Totales DESC, Producto
+    """,
+}
+
+
+class ConsultasDuckDB:
+    """
+    Motor de consultas alternativo a CuboVentas para tablas de ventas que no caben en
+    memoria: las mismas consultas (totales y ventas_por) se ejecutan como SQL en una
+    base DuckDB embebida que lee directamente el CSV o Parquet local en cada consulta.
+
+    Cada proceso tiene su propio pool de conexiones (cursores de una misma base); los
+    filtros se pasan como parámetros de las sentencias, nunca como texto SQL.
+
+    Las sentencias no se preparan de antemano: la API de Python de DuckDB no expone
+    sentencias preparadas y 'EXECUTE nombre(?)' no admite parámetros enlazados, así que
+    cada consulta vuelve a analizar y planificar su SQL. Con tres sentencias cortas ese
+    coste es despreciable frente a leer el CSV o Parquet.
+    """
+
+    def __init__(self, ruta, tam_pool=4):
+        self.ruta = ruta
+        self.tam_pool = tam_pool
+        self._pid = None
+        self._lock = threading.Lock()
+        self._abrir()
+
+    def _abrir(self):
+        """Crea la base y el pool del proceso actual (de nuevo tras un fork)."""
+        lector = 'read_parquet' if self.ruta.endswith('.parquet') else 'read_csv_auto'
+        self._base = duckdb.connect(':memory:')
+        ruta = self.ruta.replace("'", "''")
+        self._base.execute(f"CREATE VIEW ventas AS SELECT * FROM {lector}('{ruta}')")
+        self._pool = queue.LifoQueue()
+        self._creadas = 0
+        self._pid = os.getpid()
+
+    def _ejecutar(self, nombre, depto, producto):
+        """Ejecuta la sentencia 'nombre' con los filtros dados como parámetros $1 y $2."""
+        with self._conexion() as conexion:
+            return conexion.execute(SENTENCIAS[nombre], [str(depto), str(producto)]).fetchall()
+
+    @contextmanager
+    def _conexion(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._abrir()
+            if self._pool.empty() and self._creadas < self.tam_pool:
+                self._creadas += 1
+                self._pool.put(self._base.cursor())
+            pool = self._pool
+        conexion = pool.get()
+        try:
+            yield conexion
+        finally:
+            pool.put(conexion)
+
+    def _valores(self, columna):
+        with self._conexion() as conexion:
+            filas = conexion.execute(f"SELECT DISTINCT {columna} FROM ventas ORDER BY {columna}").fetchall()
+        return pd.Index([f[0] for f in filas])
+
+    @property
+    def departamentos(self):
+        return self._valores('Departamento')
+
+    @property
+    def productos(self):
+        return self._valores('Producto')
+
+    def totales(self, depto='all', producto='all'):
+        """Devuelve (ventas totales, cantidad total) del filtro."""
+        return self._ejecutar('totales', depto, producto)[0]
+
+    def ventas_por(self, dimension, depto='all', producto='all'):
+        """Ventas totales por 'Departamento' o 'Producto', de mayor a menor (como CuboVentas)."""
+        nombre = 'ventas_por_departamento' if dimension == 'Departamento' else 'ventas_por_producto'
+        return pd.DataFrame(self._ejecutar(nombre, depto, producto), columns=[dimension, 'Ventas_Totales'])
@@ -0,0 +1,74 @@
+import pandas as pd
+
+
+class CuboVentas:
+    """
+    Cubo pre-agregado de ventas por (Departamento, Producto).
+
+    Se construye una sola vez al cargar los datos: guarda, para cada par
+    (departamento, producto), la suma de Ventas_Totales, la suma de
+    Cantidad_KG y el número de filas. Cualquier combinación de filtros
+    ('all' o un valor concreto) se resuelve recortando y sumando estas
+    matrices, sin volver a tocar las filas de ventas.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        agg = df.groupby(['Departamento', 'Producto'], observed=True).agg(
+            Ventas_Totales=('Ventas_Totales', 'sum'),
+            Cantidad_KG=('Cantidad_KG', 'sum'),
+            Filas=('Ventas_Totales', 'size'),
+        )
+        self._cargar(agg)
+
+    @classmethod
+    def desde_agregado(cls, agg: pd.DataFrame):
+        """
+        Construye el cubo a partir de sumas ya calculadas por (Departamento, Producto),
+        con columnas Ventas_Totales, Cantidad_KG y Filas (p.ej. las de IngestorIncremental).
+        """
+        cubo = cls.__new__(cls)
+        cubo._cargar(agg)
+        return cubo
+
+    def _cargar(self, agg):
+        self.departamentos = pd.Index(sorted(agg.index.get_level_values(0).unique()))
+        self.productos = pd.Index(sorted(agg.index.get_level_values(1).unique()))
+        full = agg.reindex(pd.MultiIndex.from_product([self.departamentos, self.productos]), fill_value=0)
+        forma = (len(self.departamentos), len(self.productos))
+        self.ventas = full['Ventas_Totales'].to_numpy().reshape(forma)
+        self.cantidad = full['Cantidad_KG'].to_numpy().reshape(forma)
+        self.filas = full['Filas'].to_numpy().reshape(forma)
+
+    @staticmethod
+    def _posiciones(etiquetas, valor):
+        """Posiciones de 'valor' en 'etiquetas' ('all' = todas; un valor que no está, ninguna)."""
+        if valor == 'all':
+            return slice(None)
+        return [etiquetas.get_loc(valor)] if valor in etiquetas else []
+
+    def _recorte(self, depto, producto):
+        """Índices de filas y columnas del cubo que cumplen el filtro ('all' = todo)."""
+        return self._posiciones(self.departamentos, depto), self._posiciones(self.productos, producto)
+
+    def totales(self, depto='all', producto='all'):
+        """Devuelve (ventas totales, cantidad total) del filtro."""
+        filas, columnas = self._recorte(depto, producto)
+        return self.ventas[filas][:, columnas].sum(), self.cantidad[filas][:, columnas].sum()
+
+    def ventas_por(self, dimension, depto='all', producto='all'):
+        """
+        Ventas totales agrupadas por 'Departamento' o 'Producto', ordenadas de
+        mayor a menor; equivale al groupby sobre las filas filtradas.
+        """
+        filas, columnas = self._recorte(depto, producto)
+        eje = 1 if dimension == 'Departamento' else 0
+        etiquetas = self.departamentos if dimension == 'Departamento' else self.productos
+        etiquetas = etiquetas[filas] if eje == 1 else etiquetas[columnas]
+        ventas = self.ventas[filas][:, columnas].sum(axis=eje)
+        # Solo los grupos que tienen filas, como haría el groupby
+        presentes = self.filas[filas][:, columnas].sum(axis=eje) > 0
+        return (
+            pd.DataFrame({dimension: etiquetas[presentes], 'Ventas_Totales': ventas[presentes]})
+            .sort_values('Ventas_Totales', ascending=False)
+            .reset_index(drop=True)
+        )
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+import figuras
+
+# --- Umbrales del gráfico de dispersión ---
+# Hasta UMBRAL_WEBGL filas se dibuja un scatter SVG normal; por encima se usa WebGL
+# (scattergl). Por encima de UMBRAL_REDUCCION ya no se envían los puntos crudos sino
+# una muestra que preserva la densidad o agregados por celdas 2D.
+UMBRAL_WEBGL = 5_000
+UMBRAL_REDUCCION = 100_000
+PUNTOS_OBJETIVO = 20_000
+CELDAS_POR_EJE = 100
+
+
+def _celdas(df, x, y, celdas_por_eje):
+    """Asigna a cada fila el número de celda de una rejilla regular sobre (x, y)."""
+    def _bin(columna):
+        valores = df[columna].to_numpy(dtype=float)
+        minimo, maximo = np.nanmin(valores), np.nanmax(valores)
+        ancho = (maximo - minimo) / celdas_por_eje or 1.0
+        return np.clip(((valores - minimo) / ancho).astype(int), 0, celdas_por_eje - 1)
+    return _bin(x) * celdas_por_eje + _bin(y)
+
+
+def muestra_por_densidad(df, x, y, objetivo=PUNTOS_OBJETIVO, celdas_por_eje=CELDAS_POR_EJE, semilla=0):
+    """
+    Muestra estratificada por celdas de la rejilla (x, y): cada celda conserva una
+    fracción de sus puntos proporcional a su densidad, y al menos uno, de modo que
+    las zonas densas mantienen su forma y los valores atípicos no desaparecen.
+    """
+    if len(df) <= objetivo:
+        return df
+    celda = pd.Series(_celdas(df, x, y, celdas_por_eje), index=df.index)
+    por_celda = celda.map(celda.value_counts())
+    cupo = np.maximum(1, np.round(por_celda * objetivo / len(df)))
+    # Orden aleatorio dentro de cada celda y nos quedamos con los primeros 'cupo'
+    aleatorio = pd.Series(np.random.default_rng(semilla).random(len(df)), index=df.index)
+    rango = aleatorio.groupby(celda).rank(method='first')
+    return df[rango <= cupo]
+
+
+def agregado_por_celdas(df, x, y, color, tamano, celdas_por_eje=CELDAS_POR_EJE):
+    """
+    Agrega las filas por celda de la rejilla (x, y) y por 'color': un punto por celda
+    situado en el centroide, con el número de transacciones y la suma de 'tamano'.
+    """
+    celdas = df.assign(_celda=_celdas(df, x, y, celdas_por_eje))
+    return (
+        celdas.groupby([color, '_celda'], observed=True)
+              .agg(**{x: (x, 'mean'), y: (y, 'mean'), tamano: (tamano, 'sum'), 'Transacciones': (x, 'size')})
+              .reset_index()
+              .drop(columns='_celda')
+    )
+
+
+def figura_dispersion(df, modo_reduccion='muestra', **kwargs):
+    """
+    Dispersión de precio vs. cantidad (la de px.scatter, armada con figuras.dispersion) que
+    se adapta al número de filas: SVG, WebGL, o WebGL sobre una muestra / agregados por
+    celda ('muestra' o 'celdas').
+    """
+    x, y = kwargs['x'], kwargs['y']
+    titulo = kwargs.pop('title')
+    n = len(df)
+    if n > UMBRAL_REDUCCION and modo_reduccion == 'celdas':
+        agregado = agregado_por_celdas(df, x, y, kwargs['color'], kwargs['size'])
+        kwargs.pop('hover_name', None)
+        kwargs['hover_data'] = {'Transacciones': ':,', kwargs['size']: ':,.0f'}
+        titulo += f' ({len(agregado):,} celdas de {n:,} ventas)'
+        df = agregado
+    elif n > UMBRAL_REDUCCION:
+        df = muestra_por_densidad(df, x, y)
+        titulo += f' (muestra de {len(df):,} de {n:,} ventas)'
+    if len(df) > UMBRAL_WEBGL or n > UMBRAL_REDUCCION:
+        kwargs['render_mode'] = 'webgl'
+    return figuras.dispersion(df, title=titulo, **kwargs)
@@ -0,0 +1,171 @@
+from functools import lru_cache
+
+import plotly.io as pio
+
+# Figuras como diccionarios planos con la misma estructura que genera plotly.express,
+# sin pasar por la validación ni la construcción de objetos de Plotly en cada callback.
+# Las plantillas de estilo ('plotly', 'plotly_white', ...) se convierten una sola vez.
+
+TAMANO_MAXIMO = 20  # Diámetro máximo de las burbujas, el size_max por defecto de px
+
+
+@lru_cache(maxsize=None)
+def _plantilla(nombre):
+    return pio.templates[nombre].to_plotly_json()
+
+
+def _layout(template, title, **extra):
+    """Layout común a todos los gráficos: plantilla, título y lo que añada cada tipo."""
+    nombre = template or pio.templates.default
+    layout = {'template': _plantilla(nombre), 'legend': {'tracegroupgap': 0}}
+    if title is None:
+        layout['margin'] = {'t': 60}
+    else:
+        layout['title'] = {'text': title}
+    for clave, valor in extra.items():
+        if isinstance(valor, dict) and clave in layout:
+            layout[clave] = {**layout[clave], **valor}
+        else:
+            layout[clave] = valor
+    return layout
+
+
+def _ejes(etiqueta_x, etiqueta_y, **eje_x):
+    return {
+        'xaxis': {'anchor': 'y', 'domain': [0.0, 1.0], 'title': {'text': etiqueta_x}, **eje_x},
+        'yaxis': {'anchor': 'x', 'domain': [0.0, 1.0], 'title': {'text': etiqueta_y}},
+    }
+
+
+def _colores(template, n):
+    colores = _plantilla(template or pio.templates.default)['layout']['colorway']
+    return [colores[i % len(colores)] for i in range(n)]
+
+
+def _grupos(df, color):
+    """Grupos de 'color' en orden de aparición, como los traza px (uno solo si no hay color)."""
+    if color is None:
+        return [('', df)]
+    return list(df.groupby(color, sort=False, observed=True))
+
+
+def barras(df, x, y, title=None, labels=None, text=None, color=None, template=None):
+    """
+    Equivale a px.bar(df, x, y, ...). 'text' solo puede ser la columna 'y' y 'color'
+    solo la columna 'x' (una barra y una entrada de leyenda por categoría).
+    """
+    if text not in (None, y) or color not in (None, x):
+        raise ValueError("barras solo admite text=y y color=x")
+    labels = labels or {}
+    etiqueta_x, etiqueta_y = labels.get(x, x), labels.get(y, y)
+    # Si el texto es el propio valor, px lo muestra en el tooltip a través de %{text}
+    hovertemplate = f"{etiqueta_x}=%{{x}}<br>{etiqueta_y}=%{{{'text' if text else 'y'}}}<extra></extra>"
+    grupos = _grupos(df, color)
+    trazas = []
+    for (nombre, d), color_barra in zip(grupos, _colores(template, len(grupos))):
+        traza = {
+            'hovertemplate': hovertemplate,
+            'legendgroup': nombre,
+            'marker': {'color': color_barra, 'pattern': {'shape': ''}},
+            'name': nombre,
+            'orientation': 'v',
+            'showlegend': color is not None,
+            'textposition': 'auto',
+            'x': d[x].to_numpy(),
+            'xaxis': 'x',
+            'y': d[y].to_numpy(),
+            'yaxis': 'y',
+            'type': 'bar',
+        }
+        if text:
+            traza['text'] = d[text].to_numpy(dtype='float64')
+        trazas.append(traza)
+    if color is None:
+        layout = _layout(template, title, **_ejes(etiqueta_x, etiqueta_y), barmode='relative')
+    else:
+        layout = _layout(
+            template, title,
+            **_ejes(etiqueta_x, etiqueta_y, categoryorder='array', categoryarray=[n for n, _ in grupos]),
+            legend={'title': {'text': labels.get(color, color)}},
+            barmode='relative'
+        )
+    return {'data': trazas, 'layout': layout}
+
+
+def pastel(df, names, values, title=None, labels=None, hole=None, template=None):
+    """Equivale a px.pie(df, names=..., values=..., ...)."""
+    labels = labels or {}
+    traza = {
+        'domain': {'x': [0.0, 1.0], 'y': [0.0, 1.0]},
+        'hovertemplate': f"{labels.get(names, names)}=%{{label}}<br>{labels.get(values, values)}=%{{value}}<extra></extra>",
+        'labels': df[names].to_numpy(),
+        'legendgroup': '',
+        'name': '',
+        'showlegend': True,
+        'values': df[values].to_numpy(),
+        'type': 'pie',
+    }
+    if hole is not None:
+        traza['hole'] = hole
+    return {'data': [traza], 'layout': _layout(template, title)}
+
+
+def dispersion(df, x, y, size=None, color=None, hover_name=None, hover_data=None,
+               title=None, labels=None, render_mode='auto', template=None):
+    """
+    Equivale a px.scatter(df, x, y, ...). 'hover_data' es un dict columna -> formato
+    (p.ej. ':,.0f'); con render_mode='webgl' las trazas son scattergl.
+    """
+    labels = labels or {}
+    hover_data = hover_data or {}
+    etiqueta = lambda c: labels.get(c, c)
+    columnas_extra = list(hover_data)
+
+    # Líneas del tooltip en el orden de px: color, x, y, tamaño y el resto de hover_data
+    def valor_hover(columna, por_defecto):
+        if columna in hover_data:
+            return f'%{{customdata[{columnas_extra.index(columna)}]{hover_data[columna]}}}'
+        return por_defecto
+
+    lineas = [f'{etiqueta(x)}={valor_hover(x, "%{x}")}', f'{etiqueta(y)}={valor_hover(y, "%{y}")}']
+    if size:
+        lineas.append(f'{etiqueta(size)}={valor_hover(size, "%{marker.size}")}')
+    lineas += [f'{etiqueta(c)}={valor_hover(c, "")}' for c in columnas_extra if c not in (x, y, size)]
+    cabecera = '<b>%{hovertext}</b><br><br>' if hover_name else ''
+
+    sizeref = df[size].max() / TAMANO_MAXIMO ** 2 if size and len(df) else None
+    grupos = _grupos(df, color)
+    trazas = []
+    for (nombre, d), color_punto in zip(grupos, _colores(template, len(grupos))):
+        linea_color = [f'{etiqueta(color)}={nombre}'] if color else []
+        marker = {'color': color_punto, 'symbol': 'circle'}
+        if size:
+            marker.update(size=d[size].to_numpy(), sizemode='area', sizeref=sizeref)
+        traza = {
+            'hovertemplate': cabecera + '<br>'.join(linea_color + lineas) + '<extra></extra>',
+            'legendgroup': nombre,
+            'marker': marker,
+            'mode': 'markers',
+            'name': nombre,
+            'showlegend': color is not None,
+            'x': d[x].to_numpy(),
+            'xaxis': 'x',
+            'y': d[y].to_numpy(),
+            'yaxis': 'y',
+            'type': 'scattergl' if render_mode == 'webgl' else 'scatter',
+        }
+        if render_mode != 'webgl':
+            traza['orientation'] = 'v'
+        if hover_name:
+            traza['hovertext'] = d[hover_name].to_numpy()
+        if columnas_extra:
+            traza['customdata'] = d[columnas_extra].to_numpy()
+        trazas.append(traza)
+
+    leyenda = {}
+    if color:
+        leyenda['title'] = {'text': etiqueta(color)}
+    if size:
+        leyenda['itemsizing'] = 'constant'
+    return {'data': trazas, 'layout': _layout(template, title, **_ejes(etiqueta(x), etiqueta(y)), legend=leyenda)}
+
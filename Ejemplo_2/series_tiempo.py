@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+# Resoluciones precalculadas, de la más fina a la más gruesa. None = filas originales.
+RESOLUCIONES = [
+    (None, 'transacciones'),
+    ('D', 'diaria'),
+    ('W', 'semanal'),
+    ('MS', 'mensual'),
+]
+
+
+def lttb(x, y, n_puntos):
+    """
+    Largest-Triangle-Three-Buckets: devuelve los índices de 'n_puntos' puntos de (x, y)
+    que conservan la forma visual de la serie. 'x' debe estar ordenado.
+    """
+    n = len(x)
+    if n_puntos >= n or n_puntos < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    tamano_cubeta = (n - 2) / (n_puntos - 2)
+    indices = np.empty(n_puntos, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_puntos - 2):
+        inicio = int(i * tamano_cubeta) + 1
+        fin = int((i + 1) * tamano_cubeta) + 1
+        siguiente_fin = min(int((i + 2) * tamano_cubeta) + 1, n)
+        # Vértice C: promedio de la cubeta siguiente
+        cx, cy = x[fin:siguiente_fin].mean(), y[fin:siguiente_fin].mean()
+        # Área del triángulo (A, B, C) para cada candidato B de la cubeta actual
+        areas = np.abs((x[a] - cx) * (y[inicio:fin] - y[a]) - (x[a] - x[inicio:fin]) * (cy - y[a]))
+        a = inicio + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+class SerieMultiResolucion:
+    """
+    Serie temporal de 'valor' por 'grupo' con acumulados diarios, semanales y mensuales
+    precalculados. 'ventana' devuelve solo el intervalo visible, en la resolución más
+    fina que cabe en el ancho del gráfico y reducida con LTTB si aún sobra detalle.
+    """
+
+    def __init__(self, df, fecha='Fecha', grupo='Región', valor='Ventas', leer_transacciones=None):
+        """
+        leer_transacciones: función opcional (grupo, inicio, fin) -> DataFrame con 'fecha' y 'valor'.
+        Si se da, las transacciones no se guardan en memoria: se leen bajo demanda (p.ej. de un
+        AlmacenParticionado) cuando la ventana visible es lo bastante corta para mostrarlas.
+        """
+        self.fecha, self.grupo, self.valor = fecha, grupo, valor
+        self.leer_transacciones = leer_transacciones
+        self.niveles = {}
+        ordenado = df[[fecha, grupo, valor]].sort_values(fecha, kind='stable')
+        for clave, _ in RESOLUCIONES:
+            if clave is None:
+                if leer_transacciones is not None:
+                    continue
+                partes = {g: d[[fecha, valor]].reset_index(drop=True) for g, d in ordenado.groupby(grupo, observed=True)}
+            else:
+                acumulado = ordenado.set_index(fecha).groupby(grupo, observed=True)[valor].resample(clave).sum()
+                partes = {g: d.reset_index(level=0, drop=True).reset_index() for g, d in acumulado.groupby(level=0, observed=True)}
+            self.niveles[clave] = {
+                g: (d[fecha].to_numpy(dtype='datetime64[ns]'), d[valor].to_numpy()) for g, d in partes.items()
+            }
+        if leer_transacciones is not None:
+            # Transacciones por día, para saber sin leerlas cuántas caen en una ventana
+            conteos = ordenado.set_index(fecha).groupby(grupo, observed=True)[valor].resample('D').size()
+            self.conteos_diarios = {
+                g: (d.index.get_level_values(fecha).to_numpy(dtype='datetime64[ns]'), d.to_numpy())
+                for g, d in conteos.groupby(level=0, observed=True)
+            }
+
+    def agregar(self, nuevas):
+        """
+        Incorpora filas nuevas (p.ej. las añadidas al CSV) a las transacciones, a los
+        acumulados y a los conteos diarios. Solo se tocan los grupos con filas nuevas;
+        sus bins se suman a los existentes sin recalcular la serie entera.
+        """
+        nuevas = nuevas[[self.fecha, self.grupo, self.valor]].sort_values(self.fecha, kind='stable')
+        vacio = (np.array([], dtype='datetime64[ns]'), np.array([]))
+        for g, d in nuevas.groupby(self.grupo, observed=True):
+            fechas_nuevas = d[self.fecha].to_numpy(dtype='datetime64[ns]')
+            for clave, nivel in self.niveles.items():
+                fechas, valores = nivel.get(g, vacio)
+                if clave is None:
+                    fechas = np.concatenate([fechas, fechas_nuevas])
+                    valores = np.concatenate([valores, d[self.valor].to_numpy()])
+                    orden = np.argsort(fechas, kind='stable')
+                    nivel[g] = (fechas[orden], valores[orden])
+                else:
+                    nivel[g] = self._sumar_bins(fechas, valores, d.set_index(self.fecha)[self.valor], clave, 'sum')
+            if self.leer_transacciones is not None:
+                dias, conteos = self.conteos_diarios.get(g, vacio)
+                self.conteos_diarios[g] = self._sumar_bins(dias, conteos, d.set_index(self.fecha)[self.valor], 'D', 'size')
+
+    @staticmethod
+    def _sumar_bins(fechas, valores, nuevas, clave, como):
+        """Suma a los bins (fechas, valores) de frecuencia 'clave' los de la serie 'nuevas'."""
+        actual = pd.Series(valores, index=pd.DatetimeIndex(fechas), dtype='float64')
+        suma = actual.add(getattr(nuevas.resample(clave), como)(), fill_value=0)
+        # Un resample más rellena con ceros los bins vacíos entre lo anterior y lo nuevo
+        suma = suma.resample(clave).sum()
+        if como == 'size':
+            suma = suma.astype(np.int64)
+        return suma.index.to_numpy(dtype='datetime64[ns]'), suma.to_numpy()
+
+    def _transacciones_en_disco(self, grupo, inicio, fin, ancho_px):
+        """Lee las transacciones de la ventana si caben en el gráfico; si no, devuelve None."""
+        dias, conteos = self.conteos_diarios.get(grupo, (np.array([], dtype='datetime64[ns]'), np.array([])))
+        desde = 0 if inicio is None else np.searchsorted(dias, inicio.astype('datetime64[D]'), side='left')
+        hasta = len(dias) if fin is None else np.searchsorted(dias, fin, side='right')
+        if conteos[desde:hasta].sum() > ancho_px:
+            return None
+        leidas = self.leer_transacciones(grupo, inicio, fin).sort_values(self.fecha, kind='stable')
+        return leidas[[self.fecha, self.valor]].reset_index(drop=True)
+
+    def ventana(self, grupo, inicio=None, fin=None, ancho_px=1000):
+        """Devuelve (DataFrame con fecha y valor, nombre de la resolución) para el intervalo pedido."""
+        inicio = np.datetime64(pd.Timestamp(inicio), 'ns') if inicio is not None else None
+        fin = np.datetime64(pd.Timestamp(fin), 'ns') if fin is not None else None
+        for clave, nombre in RESOLUCIONES:
+            if clave is None and self.leer_transacciones is not None:
+                leidas = self._transacciones_en_disco(grupo, inicio, fin, ancho_px)
+                if leidas is not None:
+                    return leidas, nombre
+                continue
+            fechas, valores = self.niveles[clave].get(grupo, (np.array([], dtype='datetime64[ns]'), np.array([])))
+            desde = 0 if inicio is None else np.searchsorted(fechas, inicio, side='left')
+            hasta = len(fechas) if fin is None else np.searchsorted(fechas, fin, side='right')
+            if hasta - desde <= ancho_px:
+                break
+        fechas, valores = fechas[desde:hasta], valores[desde:hasta]
+        if len(fechas) > ancho_px:
+            elegidos = lttb(fechas.astype('int64'), valores, ancho_px)
+            fechas, valores = fechas[elegidos], valores[elegidos]
+            nombre += ', LTTB'
+        return pd.DataFrame({self.fecha: fechas, self.valor: valores}), nombre
@@ -0,0 +1,61 @@
+"""
+CuboVentas debe dar los mismos resultados que filtrar las filas y agrupar con
+pandas, también con valores de filtro que no están en los datos. Se ejecuta con:
+pytest test_cubo.py
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from carga import cargar_ventas
+from cubo import CuboVentas
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ventas_agricolas_sinteticas.csv')
+FILTROS = [
+    ('all', 'all'),
+    ('Antioquia', 'all'),
+    ('all', 'Papa'),
+    ('NoExiste', 'all'),
+    ('all', 'NoExiste'),
+    ('NoExiste', 'NoExiste'),
+]
+
+
+@pytest.fixture(scope='module')
+def ventas():
+    return cargar_ventas(RUTA_DATOS, usar_cache=False)
+
+
+@pytest.fixture(scope='module')
+def cubo(ventas):
+    return CuboVentas(ventas)
+
+
+def filtrar(ventas, depto, producto):
+    filtrado = ventas
+    if depto != 'all':
+        filtrado = filtrado[filtrado['Departamento'] == depto]
+    if producto != 'all':
+        filtrado = filtrado[filtrado['Producto'] == producto]
+    return filtrado
+
+
+@pytest.mark.parametrize('depto, producto', FILTROS)
+def test_totales(ventas, cubo, depto, producto):
+    filtrado = filtrar(ventas, depto, producto)
+    esperado = (filtrado['Ventas_Totales'].sum(), filtrado['Cantidad_KG'].sum())
+    assert cubo.totales(depto, producto) == pytest.approx(esperado)
+
+
+@pytest.mark.parametrize('dimension', ['Departamento', 'Producto'])
+@pytest.mark.parametrize('depto, producto', FILTROS)
+def test_ventas_por(ventas, cubo, dimension, depto, producto):
+    esperado = (
+        filtrar(ventas, depto, producto)
+        .groupby(dimension, observed=True)['Ventas_Totales'].sum()
+        .sort_values(ascending=False)
+    )
+    resultado = cubo.ventas_por(dimension, depto, producto)
+    assert list(resultado[dimension]) == list(esperado.index)
+    assert list(resultado['Ventas_Totales']) == pytest.approx(list(esperado))
@@ -0,0 +1,54 @@
+"""
+Los constructores de figuras.py deben producir exactamente la misma figura que
+plotly.express con los mismos argumentos. Se ejecuta con: pytest test_figuras.py
+"""
+import json
+import os
+
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import pytest
+
+import figuras
+from carga import cargar_ventas
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ventas_agricolas_sinteticas.csv')
+ETIQUETAS = {'Ventas_Totales': 'Ventas Totales (COP)', 'Cantidad_KG': 'Cantidad Vendida (KG)'}
+DISPERSION = dict(x='Cantidad_KG', y='Precio_KG', size='Ventas_Totales', color='Departamento',
+                  hover_name='Producto', title='Dispersión', labels=ETIQUETAS, template='plotly_white')
+
+
+@pytest.fixture(scope='module')
+def ventas():
+    return cargar_ventas(RUTA_DATOS, usar_cache=False)
+
+
+@pytest.fixture(scope='module')
+def por_producto(ventas):
+    return ventas.groupby('Producto', observed=True)['Ventas_Totales'].sum().reset_index()
+
+
+def a_json(fig):
+    return json.loads(pio.to_json(go.Figure(fig)))
+
+
+def test_barras(por_producto):
+    kwargs = dict(x='Producto', y='Ventas_Totales', title='Barras', labels=ETIQUETAS, text='Ventas_Totales')
+    assert a_json(figuras.barras(por_producto, **kwargs)) == a_json(px.bar(por_producto, **kwargs))
+
+
+def test_barras_por_color(por_producto):
+    kwargs = dict(x='Producto', y='Ventas_Totales', labels=ETIQUETAS, color='Producto', template='plotly_white')
+    assert a_json(figuras.barras(por_producto, **kwargs)) == a_json(px.bar(por_producto, **kwargs))
+
+
+def test_pastel(por_producto):
+    kwargs = dict(names='Producto', values='Ventas_Totales', title='Pastel', hole=0.3)
+    assert a_json(figuras.pastel(por_producto, **kwargs)) == a_json(px.pie(por_producto, **kwargs))
+
+
+@pytest.mark.parametrize('render_mode', ['auto', 'webgl'])
+def test_dispersion(ventas, render_mode):
+    kwargs = dict(DISPERSION, render_mode=render_mode)
+    assert a_json(figuras.dispersion(ventas, **kwargs)) == a_json(px.scatter(ventas, **kwargs))
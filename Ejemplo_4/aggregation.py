@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+# Puntos como máximo en cada sparkline: miden 60px de alto y un cuarto del ancho de la
+# página, así que más detalle no se distingue y solo engorda la respuesta
+SPARKLINE_POINTS = 90
+
+
+def daily_aggregates(dff):
+    """
+    Ventas, Beneficio y número de pedidos por día en una sola pasada: cada fila se
+    asigna a su día una vez y todas las métricas se acumulan con np.bincount. Incluye
+    los días sin ventas (con cero), igual que resample('D').
+    """
+    days = dff['Fecha'].to_numpy().astype('datetime64[D]')
+    first = days.min()
+    offsets = (days - first).astype(np.int64)
+    n_days = int(offsets.max()) + 1
+    return pd.DataFrame({
+        'Ventas': np.bincount(offsets, weights=dff['Ventas'].to_numpy(), minlength=n_days),
+        'Beneficio': np.bincount(offsets, weights=dff['Beneficio'].to_numpy(), minlength=n_days),
+        'Pedidos': np.bincount(offsets, minlength=n_days),
+    }, index=pd.DatetimeIndex(first + np.arange(n_days), name='Fecha').as_unit('ns'))
+
+
+def monthly_from_daily(daily):
+    """Acumulado mensual (etiquetado con el fin de mes) a partir de los bins diarios."""
+    return daily[['Ventas', 'Beneficio']].resample('ME').sum()
+
+
+def downsample(series, max_points=SPARKLINE_POINTS):
+    """
+    Reduce una serie diaria a 'max_points' puntos promediando cubetas consecutivas
+    de días; cada punto queda en la fecha de inicio de su cubeta.
+    """
+    if len(series) <= max_points:
+        return series
+    starts = np.linspace(0, len(series), max_points, endpoint=False).astype(np.int64)
+    sizes = np.diff(np.append(starts, len(series)))
+    means = np.add.reduceat(series.to_numpy(dtype='float64'), starts) / sizes
+    return pd.Series(means, index=series.index[starts], name=series.name)
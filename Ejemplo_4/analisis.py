@@ -1,33 +1,180 @@
+from functools import lru_cache
+import os
 import dash
 from dash import html, dcc, Input, Output, State, dash_table, ctx
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+from aggregation import daily_aggregates, monthly_from_daily, downsample
+from data_generator import generate
+from kpi_cube import KpiCube
+from publisher import DataPublisher
+from session_store import SessionStore
+from table_query import TableIndex
 
 # --- 1. Generación de Datos Simulados ---
 # Se genera un conjunto de datos aleatorio para simular ventas.
-def generate_data():
-    """Genera un DataFrame de pandas con datos de ventas simulados."""
-    np.random.seed(int(datetime.now().timestamp()) % 10000)
-    start_date = datetime(2023, 1, 1)
-    end_date = datetime.now()
-    date_range_days = (end_date - start_date).days
-
-    dates = [start_date + timedelta(days=np.random.randint(date_range_days)) for _ in range(1000)]
-    categories = ['Electrónica', 'Ropa', 'Hogar', 'Libros', 'Deportes']
-    regions = ['Norte', 'Sur', 'Este', 'Oeste', 'Centro']
-
-    df = pd.DataFrame({
-        'Fecha': pd.to_datetime(dates),
-        'Categoría': np.random.choice(categories, 1000, p=[0.3, 0.2, 0.2, 0.15, 0.15]),
-        'Región': np.random.choice(regions, 1000),
-        'Ventas': np.random.uniform(50, 2000, 1000).round(2),
-        'Cantidad': np.random.randint(1, 10, 1000)
-    })
-    df['Beneficio'] = (df['Ventas'] * np.random.uniform(0.1, 0.4, 1000)).round(2)
-    return df
+def generate_data(n_rows=1000, seed=None):
+    """
+    Genera un DataFrame de pandas con datos de ventas simulados. Para volúmenes
+    grandes (pruebas de carga) ver data_generator.py, que genera por bloques.
+    """
+    if seed is None:
+        seed = int(datetime.now().timestamp()) % 10000
+    return generate(n_rows, seed=seed)
+
+# Cada cuánto se generan datos nuevos (en el servidor, una vez para todas las sesiones)
+# y cada cuánto pregunta cada pestaña si hay una versión nueva
+REFRESH_INTERVAL_S = 5 * 60
+POLL_INTERVAL_MS = 60 * 1000
+
+# 'full': en cada intervalo se regeneran todos los datos y se reenvían las figuras.
+# 'delta': en cada intervalo llegan ventas nuevas (se añaden al final) y a cada sesión
+# solo se le envían los puntos añadidos (pensado para pantallas que pasan horas abiertas)
+REFRESH_MODE = os.environ.get('VENTAS_REFRESH', 'full')
+NEW_ROWS_PER_TICK = 20
+
+def generate_new_sales(df, n_rows=NEW_ROWS_PER_TICK):
+    """Ventas nuevas con fecha de hoy, para añadir a los datos publicados."""
+    today = pd.Timestamp.now().normalize()
+    return generate(n_rows, start_date=today, end_date=today + pd.Timedelta(days=1))
+
+# Un solo conjunto de datos por intervalo, compartido por todas las sesiones
+publisher = DataPublisher(
+    generate_data, interval=REFRESH_INTERVAL_S,
+    new_rows=generate_new_sales if REFRESH_MODE == 'delta' else None
+)
+publisher.start()
+
+# Los datos de cada sesión se guardan en el servidor; el navegador solo conserva el token
+session_store = SessionStore(max_sessions=32, ttl=30 * 60)
+
+# Filas por página de la tabla de detalle
+TABLE_PAGE_SIZE = 15
+
+def selection_mask(df, start_date, end_date, selected_regions, selected_categories):
+    """Máscara de las filas que cumplen los filtros del panel lateral."""
+    return (
+        (df['Fecha'] >= pd.to_datetime(start_date)) &
+        (df['Fecha'] <= pd.to_datetime(end_date)) &
+        (df['Región'].isin(selected_regions)) &
+        (df['Categoría'].isin(selected_categories))
+    ).to_numpy()
+
+# Índice de la tabla de detalle, uno por versión de los datos
+table_index = session_store.per_version(TableIndex)
+
+# En modo 'delta', lo último que se envió a cada sesión para cada figura (versión,
+# filtros y, para la serie temporal, los valores mensuales), clave '<token>:<figura>'
+emitted = SessionStore(max_sessions=64, ttl=30 * 60)
+
+def filter_key(start_date, end_date, selected_regions, selected_categories):
+    """Filtros del panel en forma hasheable, para usarlos como clave de caché."""
+    return start_date, end_date, tuple(selected_regions or ()), tuple(selected_categories or ())
+
+# --- Figuras ---
+def create_sparkline(data, color):
+    fig = go.Figure(go.Scatter(
+        x=data.index, y=data.values, mode='lines',
+        line=dict(color=color, width=2), fill='tozeroy'
+    ))
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=0, b=0),
+        plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(visible=False), yaxis=dict(visible=False)
+    )
+    return fig
+
+def create_scatter(dff):
+    # Gráfico de Ventas vs. Beneficio
+    scatter_fig = go.Figure(data=go.Scatter(
+        x=dff['Ventas'],
+        y=dff['Beneficio'],
+        mode='markers',
+        marker=dict(
+            size=dff['Cantidad']*2,
+            color=dff['Ventas'],
+            colorscale='Viridis',
+            showscale=True,
+            colorbar_title='Ventas'
+        ),
+        text=dff['Categoría'],
+        hovertemplate='<b>Venta:</b> %{x:$,.2f}<br><b>Beneficio:</b> %{y:$,.2f}<br><b>Categoría:</b> %{text}<extra></extra>'
+    ))
+    scatter_fig.update_layout(
+        title='Análisis de Rentabilidad por Venta',
+        xaxis_title='Ventas ($)',
+        yaxis_title='Beneficio ($)',
+        transition_duration=500
+    )
+    return scatter_fig
+
+def create_time_series(sales_over_time):
+    # Gráfico de Series Temporales
+    # Valores como listas (no arrays binarios) para poder modificarlos por posición con Patch
+    time_series_fig = go.Figure()
+    time_series_fig.add_trace(go.Scatter(x=sales_over_time['Fecha'], y=sales_over_time['Ventas'].tolist(), mode='lines+markers', name='Ventas'))
+    time_series_fig.add_trace(go.Scatter(x=sales_over_time['Fecha'], y=sales_over_time['Beneficio'].tolist(), mode='lines+markers', name='Beneficio'))
+    time_series_fig.update_layout(
+        title='Evolución Mensual de Ventas y Beneficios',
+        xaxis_title='Fecha',
+        yaxis_title='Monto ($)',
+        legend_title='Métrica'
+    )
+    return time_series_fig
+
+class PageData:
+    """
+    Resultados de cada componente de la página para una versión de los datos, guardados
+    por combinación de filtros. Cada componente tiene su propio callback: al cambiar un
+    control solo se calcula lo que no esté ya en caché, y todas las sesiones que ven la
+    misma versión comparten estos resultados.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.cube = KpiCube(df)
+        for name in ('mask', 'filtered', 'daily', 'monthly', 'kpis', 'sparklines', 'time_series', 'scatter'):
+            setattr(self, name, lru_cache(maxsize=16)(getattr(self, '_' + name)))
+
+    def _mask(self, key):
+        return selection_mask(self.df, *key)
+
+    def _filtered(self, key):
+        return self.df[self.mask(key)] # DataFrame filtrado
+
+    def _daily(self, key):
+        # Una sola pasada por día para todas las métricas; el mensual sale de los bins diarios
+        return daily_aggregates(self.filtered(key))
+
+    def _kpis(self, key):
+        # Salen del cubo de sumas acumuladas: dos búsquedas binarias y una resta, sin recorrer las filas
+        total_sales, total_profit, total_orders = self.cube.totals(*key)
+        avg_ticket = total_sales / total_orders if total_orders else 0
+        return f"${total_sales:,.0f}", f"${total_profit:,.0f}", f"{total_orders:,}", f"${avg_ticket:,.2f}"
+
+    def _sparklines(self, key):
+        # Las sparklines solo tienen 60px de alto: se reducen a un número fijo de puntos
+        daily = self.daily(key)
+        return (
+            create_sparkline(downsample(daily['Ventas']), '#0d6efd'),
+            create_sparkline(downsample(daily['Beneficio']), '#198754'),
+            create_sparkline(downsample(daily['Pedidos']), '#ffc107'),
+        )
+
+    def _monthly(self, key):
+        return monthly_from_daily(self.daily(key))
+
+    def _time_series(self, key):
+        return create_time_series(self.monthly(key).reset_index())
+
+    def _scatter(self, key):
+        return create_scatter(self.filtered(key))
+
+# Resultados de los componentes, uno por versión de los datos
+page_data = session_store.per_version(PageData)
 
 # --- 2. Inicialización de la App ---
 # Se crea la instancia de la aplicación Dash con un tema de Bootstrap.
@@ -93,19 +240,79 @@ sidebar = dbc.Offcanvas(
 )
 
 # --- Contenido Principal de la Página ---
-content = html.Div(id='page-content', style={'padding':'2rem 1rem'})
+# La estructura es fija; cada callback rellena solo las propiedades de su componente
+def kpi_card(title, value_id, spark_id=None):
+    body = [html.H6(title, className="card-title"), html.H2(id=value_id)]
+    if spark_id:
+        body.append(dcc.Graph(id=spark_id, config={'displayModeBar': False}, style={'height': '60px'}))
+    return dbc.Col(dbc.Card(dbc.CardBody(body)), lg=3, sm=6, className="mb-4")
+
+# Tabla de Datos: paginada, ordenada y filtrada en el servidor (update_detail_table);
+# el navegador solo recibe la página visible
+data_table = dash_table.DataTable(
+    id='detail-table',
+    data=[],
+    columns=[
+        {'name': 'Fecha', 'id': 'Fecha', 'type': 'datetime'},
+        {'name': 'Categoría', 'id': 'Categoría', 'type': 'text'},
+        {'name': 'Región', 'id': 'Región', 'type': 'text'},
+        {'name': 'Ventas', 'id': 'Ventas', 'type': 'numeric'},
+        {'name': 'Cantidad', 'id': 'Cantidad', 'type': 'numeric'},
+        {'name': 'Beneficio', 'id': 'Beneficio', 'type': 'numeric'},
+    ],
+    page_current=0,
+    page_size=TABLE_PAGE_SIZE,
+    page_action='custom',
+    filter_action='custom',
+    filter_query='',
+    sort_action='custom',
+    sort_mode='multi',
+    sort_by=[],
+    style_table={'overflowX': 'auto'},
+    style_cell={'textAlign': 'left', 'padding': '5px'},
+    style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'}
+)
+
+content = html.Div(id='page-content', style={'padding':'2rem 1rem'}, children=[
+    html.Div(id='page-alert'),
+    html.Div(id='page-body', style={'display': 'none'}, children=[
+        dbc.Row([
+            kpi_card("Ventas Totales", 'kpi-sales', 'spark-sales'),
+            kpi_card("Beneficio Total", 'kpi-profit', 'spark-profit'),
+            kpi_card("Pedidos Totales", 'kpi-orders', 'spark-orders'),
+            kpi_card("Ticket Promedio", 'kpi-ticket'),
+        ]),
+        dbc.Row([
+            dbc.Col(dcc.Graph(id='time-series-graph'), lg=7),
+            dbc.Col(dcc.Graph(id='scatter-graph'), lg=5),
+        ], className="mb-4"),
+        dbc.Card(dbc.CardBody([
+            html.H4("Datos Detallados", className="card-title"),
+            html.Small(id='detail-row-count', className="text-muted"),
+            data_table
+        ]))
+    ])
+])
 
 # --- Layout General de la Aplicación ---
 app.layout = html.Div([
-    dcc.Store(id='raw-data-store'), # Almacena los datos brutos sin filtrar
+    dcc.Store(id='raw-data-store'), # Token de la sesión; los datos brutos quedan en session_store
     navbar,
     sidebar,
     content,
-    dcc.Interval(id='interval-refresh', interval=5 * 60 * 1000, n_intervals=0) # Refresco automático cada 5 minutos
+    dcc.Interval(id='interval-refresh', interval=POLL_INTERVAL_MS, n_intervals=0) # Comprueba si se publicaron datos nuevos
 ])
 
 # --- 4. Callbacks (Lógica de la Aplicación) ---
 
+# Filtros del panel lateral, de los que dependen todos los componentes de la página
+FILTER_INPUTS = [
+    Input('date-range-picker', 'start_date'),
+    Input('date-range-picker', 'end_date'),
+    Input('region-checklist', 'value'),
+    Input('category-dropdown', 'value'),
+]
+
 @app.callback(
     Output('sidebar', 'is_open'),
     Input('btn-sidebar', 'n_clicks'),
@@ -121,139 +328,197 @@ def toggle_sidebar(n_clicks, is_open):
 @app.callback(
     Output('raw-data-store', 'data'),
     Input('refresh-data-btn', 'n_clicks'),
-    Input('interval-refresh', 'n_intervals')
+    Input('interval-refresh', 'n_intervals'),
+    State('raw-data-store', 'data')
 )
-def update_raw_data(n_clicks, n_intervals):
-    """Genera y almacena nuevos datos cuando se presiona el botón o se cumple el intervalo."""
-    df = generate_data()
-    return df.to_dict('records')
+def update_raw_data(n_clicks, n_intervals, store):
+    """
+    Asigna a la sesión la última versión publicada de los datos. El botón publica una
+    versión nueva (para todas las sesiones); en cada tick del intervalo solo se compara
+    la versión y, si la sesión ya la tiene, no se hace nada.
+    """
+    if ctx.triggered_id == 'refresh-data-btn':
+        publisher.refresh()
+    version, df = publisher.latest()
+    token = (store or {}).get('token')
+    if store and store['version'] == version and session_store.get(token) is not None:
+        return dash.no_update
+    # Se reutiliza el token de la sesión; el DataFrame es el mismo objeto para todas
+    return session_store.put(df, token=token, version=version)
 
 @app.callback(
-    Output('page-content', 'children'),
+    Output('page-alert', 'children'),
+    Output('page-body', 'style'),
     Input('raw-data-store', 'data'),
-    Input('date-range-picker', 'start_date'),
-    Input('date-range-picker', 'end_date'),
-    Input('region-checklist', 'value'),
-    Input('category-dropdown', 'value')
+    *FILTER_INPUTS
+)
+def update_page_status(store, *filters):
+    """Muestra un aviso (y oculta el contenido) si todavía no hay datos o no hay coincidencias."""
+    if not store:
+        return dbc.Alert("Generando datos, por favor espere...", color="info"), {'display': 'none'}
+    view = page_data(store['token'], store['version'])
+    if view is None:
+        return dbc.Alert("Los datos de esta sesión caducaron. Pulse 'Refrescar Datos'.", color="warning"), {'display': 'none'}
+    if view.filtered(filter_key(*filters)).empty:
+        return dbc.Alert("No hay datos que coincidan con los filtros seleccionados.", color="warning"), {'display': 'none'}
+    return None, {}
+
+@app.callback(
+    Output('kpi-sales', 'children'),
+    Output('kpi-profit', 'children'),
+    Output('kpi-orders', 'children'),
+    Output('kpi-ticket', 'children'),
+    Input('raw-data-store', 'data'),
+    *FILTER_INPUTS
+)
+def update_kpis(store, *filters):
+    """Tarjetas de KPIs, desde el cubo de sumas acumuladas."""
+    view = page_data(store['token'], store['version']) if store else None
+    if view is None:
+        return dash.no_update
+    return view.kpis(filter_key(*filters))
+
+@app.callback(
+    Output('spark-sales', 'figure'),
+    Output('spark-profit', 'figure'),
+    Output('spark-orders', 'figure'),
+    Input('raw-data-store', 'data'),
+    *FILTER_INPUTS
 )
-def update_page_content(raw_data, start_date, end_date, selected_regions, selected_categories):
+def update_sparklines(store, *filters):
+    """Sparklines diarias de las tarjetas de KPIs."""
+    view = page_data(store['token'], store['version']) if store else None
+    key = filter_key(*filters)
+    # Sin filas no hay serie diaria; update_page_status ya muestra el aviso
+    if view is None or view.filtered(key).empty:
+        return dash.no_update
+    return view.sparklines(key)
+
+def appended_rows(store, last, key):
     """
-    Filtra los datos según los controles y renderiza todo el contenido del dashboard.
-    Este es el callback principal que reacciona a todos los filtros.
+    Filas filtradas que la sesión todavía no ha recibido, si la versión nueva solo añade
+    filas a la que ya tiene en pantalla con los mismos filtros ('last' es lo último que
+    se le envió). None si hay que enviar la figura completa.
     """
-    if not raw_data:
-        return dbc.Alert("Generando datos, por favor espere...", color="info")
+    if REFRESH_MODE != 'delta' or ctx.triggered_id != 'raw-data-store':
+        return None
+    if last is None or last['key'] != key:
+        return None
+    offset = publisher.appended_since(last['version'], store['version'])
+    df = session_store.get(store['token'])
+    if offset is None or df is None:
+        return None
+    new = df.iloc[offset:]
+    return new[selection_mask(new, *key)]
 
-    # Convertir datos del Store a DataFrame
-    df = pd.DataFrame(raw_data)
-    df['Fecha'] = pd.to_datetime(df['Fecha'])
-
-    # Aplicar filtros
-    mask = (
-        (df['Fecha'] >= pd.to_datetime(start_date)) &
-        (df['Fecha'] <= pd.to_datetime(end_date)) &
-        (df['Región'].isin(selected_regions)) &
-        (df['Categoría'].isin(selected_categories))
-    )
-    dff = df[mask] # dff es el DataFrame filtrado
-
-    if dff.empty:
-        return dbc.Alert("No hay datos que coincidan con los filtros seleccionados.", color="warning")
-
-    # --- Cálculos de KPIs ---
-    total_sales = dff['Ventas'].sum()
-    total_profit = dff['Beneficio'].sum()
-    total_orders = len(dff)
-    avg_ticket = total_sales / total_orders if total_orders else 0
-
-    # --- Creación de Gráficos Sparkline ---
-    def create_sparkline(data, color):
-        fig = go.Figure(go.Scatter(
-            x=data.index, y=data.values, mode='lines',
-            line=dict(color=color, width=2), fill='tozeroy'
-        ))
-        fig.update_layout(
-            margin=dict(l=0, r=0, t=0, b=0),
-            plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(visible=False), yaxis=dict(visible=False)
-        )
-        return fig
-
-    sales_by_day = dff.set_index('Fecha').resample('D')['Ventas'].sum()
-    profit_by_day = dff.set_index('Fecha').resample('D')['Beneficio'].sum()
-    orders_by_day = dff.set_index('Fecha').resample('D')['Cantidad'].count()
-
-    spark_sales = create_sparkline(sales_by_day, '#0d6efd')
-    spark_profit = create_sparkline(profit_by_day, '#198754')
-    spark_orders = create_sparkline(orders_by_day, '#ffc107')
-
-    # --- Creación de Componentes del Layout ---
-    kpi_cards = dbc.Row([
-        dbc.Col(dbc.Card(dbc.CardBody([html.H6("Ventas Totales", className="card-title"), html.H2(f"${total_sales:,.0f}"), dcc.Graph(figure=spark_sales, config={'displayModeBar': False}, style={'height': '60px'})])), lg=3, sm=6, className="mb-4"),
-        dbc.Col(dbc.Card(dbc.CardBody([html.H6("Beneficio Total", className="card-title"), html.H2(f"${total_profit:,.0f}"), dcc.Graph(figure=spark_profit, config={'displayModeBar': False}, style={'height': '60px'})])), lg=3, sm=6, className="mb-4"),
-        dbc.Col(dbc.Card(dbc.CardBody([html.H6("Pedidos Totales", className="card-title"), html.H2(f"{total_orders:,}"), dcc.Graph(figure=spark_orders, config={'displayModeBar': False}, style={'height': '60px'})])), lg=3, sm=6, className="mb-4"),
-        dbc.Col(dbc.Card(dbc.CardBody([html.H6("Ticket Promedio", className="card-title"), html.H2(f"${avg_ticket:,.2f}")])), lg=3, sm=6, className="mb-4"),
-    ])
+@app.callback(
+    Output('time-series-graph', 'figure'),
+    Output('time-series-graph', 'extendData'),
+    Input('raw-data-store', 'data'),
+    *FILTER_INPUTS
+)
+def update_time_series(store, *filters):
+    """
+    Evolución mensual de ventas y beneficios. En modo 'delta', si solo llegaron ventas
+    nuevas, los meses nuevos se envían con extendData y los ya dibujados que cambian
+    (normalmente el mes en curso) con un Patch de sus valores.
+    """
+    view = page_data(store['token'], store['version']) if store else None
+    key = filter_key(*filters)
+    if view is None or view.filtered(key).empty:
+        return dash.no_update, dash.no_update
+    state_key = f"{store['token']}:time-series"
+    last = emitted.get(state_key)
+    new = appended_rows(store, last, key)
+    if new is None:
+        if REFRESH_MODE == 'delta':
+            emitted.put({'version': store['version'], 'key': key, 'monthly': view.monthly(key)}, token=state_key)
+        return view.time_series(key), dash.no_update
 
-    # Gráfico de Ventas vs. Beneficio
-    scatter_fig = go.Figure(data=go.Scatter(
-        x=dff['Ventas'],
-        y=dff['Beneficio'],
-        mode='markers',
-        marker=dict(
-            size=dff['Cantidad']*2,
-            color=dff['Ventas'],
-            colorscale='Viridis',
-            showscale=True,
-            colorbar_title='Ventas'
-        ),
-        text=dff['Categoría'],
-        hovertemplate='<b>Venta:</b> %{x:$,.2f}<br><b>Beneficio:</b> %{y:$,.2f}<br><b>Categoría:</b> %{text}<extra></extra>'
-    ))
-    scatter_fig.update_layout(
-        title='Análisis de Rentabilidad por Venta',
-        xaxis_title='Ventas ($)',
-        yaxis_title='Beneficio ($)',
-        transition_duration=500
-    )
+    old = last['monthly']
+    monthly = old
+    if not new.empty:
+        monthly = old.add(monthly_from_daily(daily_aggregates(new)), fill_value=0).resample('ME').sum()
+        if not monthly.index[:len(old)].equals(old.index):
+            # Ventas anteriores al primer mes dibujado: no es un simple añadido
+            emitted.put({'version': store['version'], 'key': key, 'monthly': view.monthly(key)}, token=state_key)
+            return view.time_series(key), dash.no_update
+    emitted.put({'version': store['version'], 'key': key, 'monthly': monthly}, token=state_key)
 
-    # Gráfico de Series Temporales
-    sales_over_time = dff.set_index('Fecha').resample('ME')[['Ventas', 'Beneficio']].sum().reset_index()
-    time_series_fig = go.Figure()
-    time_series_fig.add_trace(go.Scatter(x=sales_over_time['Fecha'], y=sales_over_time['Ventas'], mode='lines+markers', name='Ventas'))
-    time_series_fig.add_trace(go.Scatter(x=sales_over_time['Fecha'], y=sales_over_time['Beneficio'], mode='lines+markers', name='Beneficio'))
-    time_series_fig.update_layout(
-        title='Evolución Mensual de Ventas y Beneficios',
-        xaxis_title='Fecha',
-        yaxis_title='Monto ($)',
-        legend_title='Métrica'
-    )
+    changed = np.flatnonzero((monthly.iloc[:len(old)].to_numpy() != old.to_numpy()).any(axis=1))
+    added = monthly.iloc[len(old):]
+    if len(changed):
+        patch = dash.Patch()
+        for trace, column in enumerate(['Ventas', 'Beneficio']):
+            for i in changed:
+                patch['data'][trace]['y'][int(i)] = float(monthly[column].iloc[i])
+            if not added.empty:
+                patch['data'][trace]['x'].extend(added.index.tolist())
+                patch['data'][trace]['y'].extend(added[column].tolist())
+        return patch, dash.no_update
+    if not added.empty:
+        dates = added.index.tolist()
+        return dash.no_update, [{'x': [dates, dates], 'y': [added['Ventas'].tolist(), added['Beneficio'].tolist()]}, [0, 1]]
+    return dash.no_update, dash.no_update
 
-    # Tabla de Datos
-    data_table = dash_table.DataTable(
-        data=dff.to_dict('records'),
-        columns=[{'name': i, 'id': i} for i in dff.columns],
-        page_size=15,
-        filter_action='native',
-        sort_action='native',
-        style_table={'overflowX': 'auto'},
-        style_cell={'textAlign': 'left', 'padding': '5px'},
-        style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'}
-    )
+@app.callback(
+    Output('scatter-graph', 'figure'),
+    Output('scatter-graph', 'extendData'),
+    Input('raw-data-store', 'data'),
+    *FILTER_INPUTS
+)
+def update_scatter(store, *filters):
+    """
+    Dispersión de ventas frente a beneficio. En modo 'delta', si solo llegaron ventas
+    nuevas, se añaden sus puntos con extendData en lugar de reenviar todos.
+    """
+    view = page_data(store['token'], store['version']) if store else None
+    if view is None:
+        return dash.no_update, dash.no_update
+    key = filter_key(*filters)
+    state_key = f"{store['token']}:scatter"
+    new = appended_rows(store, emitted.get(state_key), key)
+    if REFRESH_MODE == 'delta':
+        emitted.put({'version': store['version'], 'key': key}, token=state_key)
+    if new is None:
+        return view.scatter(key), dash.no_update
+    if new.empty:
+        return dash.no_update, dash.no_update
+    return dash.no_update, [{
+        'x': [new['Ventas'].tolist()],
+        'y': [new['Beneficio'].tolist()],
+        'marker.size': [(new['Cantidad'] * 2).tolist()],
+        'marker.color': [new['Ventas'].tolist()],
+        'text': [new['Categoría'].astype(str).tolist()],
+    }, [0]]
 
-    # Ensamblar el layout final de la página
-    return html.Div([
-        kpi_cards,
-        dbc.Row([
-            dbc.Col(dcc.Graph(figure=time_series_fig), lg=7),
-            dbc.Col(dcc.Graph(figure=scatter_fig), lg=5),
-        ], className="mb-4"),
-        dbc.Card(dbc.CardBody([
-            html.H4("Datos Detallados", className="card-title"),
-            data_table
-        ]))
-    ])
+@app.callback(
+    Output('detail-table', 'data'),
+    Output('detail-table', 'page_count'),
+    Output('detail-table', 'page_current'),
+    Output('detail-row-count', 'children'),
+    Input('detail-table', 'page_current'),
+    Input('detail-table', 'page_size'),
+    Input('detail-table', 'sort_by'),
+    Input('detail-table', 'filter_query'),
+    Input('raw-data-store', 'data'),
+    *FILTER_INPUTS
+)
+def update_detail_table(page_current, page_size, sort_by, filter_query, store, *filters):
+    """
+    Devuelve solo la página pedida de la tabla de detalle, aplicando en el servidor los
+    filtros del panel, el filtro escrito en la tabla y el orden elegido. Si cambian los
+    datos o los filtros del panel se vuelve a la primera página.
+    """
+    index = table_index(store['token'], store['version']) if store else None
+    if index is None:
+        return [], 0, 0, ""
+    if ctx.triggered_id not in (None, 'detail-table'):
+        page_current = 0
+    mask = page_data(store['token'], store['version']).mask(filter_key(*filters))
+    rows, total = index.query(page_current, page_size, sort_by, filter_query, row_mask=mask)
+    return rows, max(1, -(-total // page_size)), page_current, f"{total:,} filas"
 
 # --- 5. Ejecución de la Aplicación ---
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
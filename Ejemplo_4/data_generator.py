@@ -0,0 +1,78 @@
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ['Electrónica', 'Ropa', 'Hogar', 'Libros', 'Deportes']
+CATEGORY_WEIGHTS = [0.3, 0.2, 0.2, 0.15, 0.15]
+REGIONS = ['Norte', 'Sur', 'Este', 'Oeste', 'Centro']
+START_DATE = datetime(2023, 1, 1)
+
+
+def generate_chunks(n_rows, seed=None, chunk_size=1_000_000, start_date=START_DATE, end_date=None):
+    """
+    Genera 'n_rows' ventas simuladas en bloques de como mucho 'chunk_size' filas, con la
+    misma distribución que generate_data. Todo se calcula con operaciones vectorizadas
+    de NumPy (las fechas con aritmética datetime64), así que la memoria usada depende
+    del tamaño del bloque y no del total. Con la misma semilla y el mismo tamaño de
+    bloque se obtienen siempre los mismos datos.
+    """
+    rng = np.random.default_rng(seed)
+    start = np.datetime64(pd.Timestamp(start_date).normalize(), 'D')
+    date_range_days = ((end_date or datetime.now()) - start_date).days
+    categories = pd.CategoricalDtype(CATEGORIES)
+    regions = pd.CategoricalDtype(REGIONS)
+
+    for offset in range(0, n_rows, chunk_size):
+        n = min(chunk_size, n_rows - offset)
+        days = rng.integers(0, date_range_days, n).astype('timedelta64[D]')
+        sales = rng.uniform(50, 2000, n).round(2)
+        yield pd.DataFrame({
+            'Fecha': (start + days).astype('datetime64[ns]'),
+            'Categoría': pd.Categorical.from_codes(rng.choice(len(CATEGORIES), n, p=CATEGORY_WEIGHTS), dtype=categories),
+            'Región': pd.Categorical.from_codes(rng.integers(0, len(REGIONS), n), dtype=regions),
+            'Ventas': sales,
+            'Cantidad': rng.integers(1, 10, n, dtype=np.int8),
+            'Beneficio': (sales * rng.uniform(0.1, 0.4, n)).round(2),
+        }, index=pd.RangeIndex(offset, offset + n))
+
+
+def generate(n_rows, seed=None, chunk_size=1_000_000, **kwargs):
+    """Todas las filas en un solo DataFrame (para tamaños que caben en memoria)."""
+    chunks = list(generate_chunks(n_rows, seed, chunk_size, **kwargs))
+    if not chunks:
+        # Sin filas no hay bloques: se recorta una fila generada para conservar columnas y tipos
+        return next(generate_chunks(1, seed, 1, **kwargs)).iloc[:0]
+    return pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+
+
+def write_parquet(path, n_rows, seed=None, chunk_size=1_000_000, **kwargs):
+    """
+    Escribe las ventas directamente a un archivo Parquet, bloque a bloque (un row group
+    por bloque), sin tener nunca el conjunto completo en memoria. Requiere pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in generate_chunks(n_rows, seed, chunk_size, **kwargs):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+if __name__ == '__main__':
+    # Ejemplo: python data_generator.py 20000000 ventas.parquet --seed 42
+    parser = argparse.ArgumentParser(description="Genera ventas simuladas para pruebas de carga.")
+    parser.add_argument('rows', type=int, help="número de filas")
+    parser.add_argument('output', help="archivo Parquet de salida")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    args = parser.parse_args()
+    write_parquet(args.output, args.rows, seed=args.seed, chunk_size=args.chunk_size)
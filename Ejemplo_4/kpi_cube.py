@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+
+def _codes(column):
+    """Códigos enteros y etiquetas de una columna categórica o de texto."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), pd.Index(column.cat.categories)
+    codes, labels = pd.factorize(column)
+    return codes, pd.Index(labels)
+
+
+class KpiCube:
+    """
+    Sumas acumuladas por día de Ventas, Beneficio y número de pedidos para cada
+    (Región, Categoría). Los totales de cualquier rango de fechas salen de restar dos
+    filas del acumulado (localizadas por búsqueda binaria en el eje de días), así que
+    el coste de una consulta no depende del número de transacciones.
+
+    Supone fechas a nivel de día (a medianoche), como las de generate_data.
+    """
+
+    def __init__(self, df):
+        days = df['Fecha'].to_numpy().astype('datetime64[D]')
+        first = days.min()
+        day_offsets = (days - first).astype(np.int64)
+        n_days = int(day_offsets.max()) + 1
+        region_codes, self.regions = _codes(df['Región'])
+        category_codes, self.categories = _codes(df['Categoría'])
+        self.days = (first + np.arange(n_days)).astype('datetime64[ns]')
+
+        shape = (n_days, len(self.regions), len(self.categories))
+        cell = np.ravel_multi_index((day_offsets, region_codes, category_codes), shape)
+        size = int(np.prod(shape))
+
+        def cumulative(weights=None):
+            per_day = np.bincount(cell, weights=weights, minlength=size).reshape(shape)
+            # Fila inicial de ceros: el total de [i0, i1) es cum[i1] - cum[i0]
+            return np.concatenate([np.zeros((1,) + shape[1:]), per_day.cumsum(axis=0)])
+
+        self.sales = cumulative(df['Ventas'].to_numpy(dtype='float64'))
+        self.profit = cumulative(df['Beneficio'].to_numpy(dtype='float64'))
+        self.orders = cumulative().astype(np.int64)
+
+    def totals(self, start_date, end_date, regions, categories):
+        """(ventas, beneficio, pedidos) de las filas con start_date <= Fecha <= end_date."""
+        start = np.searchsorted(self.days, np.datetime64(pd.Timestamp(start_date), 'ns'), side='left')
+        end = np.searchsorted(self.days, np.datetime64(pd.Timestamp(end_date), 'ns'), side='right')
+        if end <= start:
+            return 0.0, 0.0, 0
+        r = self.regions.get_indexer(pd.Index(regions or []))
+        c = self.categories.get_indexer(pd.Index(categories or []))
+        cells = np.ix_(r[r >= 0], c[c >= 0])
+        return tuple(
+            (cum[end] - cum[start])[cells].sum()
+            for cum in (self.sales, self.profit, self.orders)
+        )
@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class DataPublisher:
+    """
+    Genera un único conjunto de datos por intervalo de refresco y lo publica para
+    todas las sesiones.
+
+    Un hilo en segundo plano llama a 'generate' cada 'interval' segundos y sube la
+    versión. Los callbacks de cada pestaña solo comparan la versión que ya tienen con
+    'version'; así el coste de generar no crece con el número de pestañas abiertas.
+
+    Si se da 'new_rows(df)', en cada intervalo no se regenera todo: se añaden al final
+    las filas que devuelva (ventas nuevas), y appended_since permite a los callbacks
+    enviar solo lo añadido.
+    """
+
+    def __init__(self, generate, interval=5 * 60, new_rows=None, history=100):
+        self.generate = generate
+        self.interval = interval
+        self.new_rows = new_rows
+        self.version = 0
+        self.df = None
+        # versión -> (versión anterior, filas que tenía) si se creó añadiendo filas, o None
+        self._history = OrderedDict()
+        self._history_size = history
+        self._lock = threading.Lock()
+        self._thread = None
+        self.refresh()
+
+    def _publish(self, df, parent):
+        self.version += 1
+        self.df = df
+        self._history[self.version] = parent
+        while len(self._history) > self._history_size:
+            self._history.popitem(last=False)
+        return self.version
+
+    def refresh(self):
+        """Genera y publica una versión nueva ahora mismo. Devuelve su número."""
+        df = self.generate()
+        with self._lock:
+            return self._publish(df, None)
+
+    def append(self, rows):
+        """Publica una versión nueva con 'rows' añadidas al final de la actual."""
+        with self._lock:
+            parent = (self.version, len(self.df))
+            return self._publish(pd.concat([self.df, rows], ignore_index=True), parent)
+
+    def appended_since(self, old_version, new_version):
+        """
+        Si 'new_version' se obtuvo de 'old_version' solo añadiendo filas, devuelve cuántas
+        filas tenía 'old_version' (las nuevas empiezan ahí); si no, None.
+        """
+        with self._lock:
+            version, offset = new_version, None
+            while version != old_version:
+                link = self._history.get(version)
+                if link is None:
+                    return None
+                version, offset = link
+            return offset
+
+    def latest(self):
+        """(versión, DataFrame) publicados más recientes."""
+        with self._lock:
+            return self.version, self.df
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                if self.new_rows is None:
+                    self.refresh()
+                else:
+                    self.append(self.new_rows(self.latest()[1]))
+            except Exception as e:
+                print(f"Error al generar datos: {e}")
+
+    def start(self):
+        """Arranca el hilo de refresco (una sola vez por proceso)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='data-publisher', daemon=True)
+                self._thread.start()
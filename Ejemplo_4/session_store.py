@@ -0,0 +1,84 @@
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class SessionStore:
+    """
+    Almacén en el servidor de los DataFrames de cada sesión del navegador.
+
+    El navegador solo guarda el token (en un dcc.Store); el DataFrame se queda aquí
+    tal cual, con sus tipos (fechas como datetime64), sin viajar como JSON en cada
+    callback. Como máximo se guardan 'max_sessions' sesiones: al superar el límite
+    se descarta la usada hace más tiempo, y las que llevan más de 'ttl' segundos sin
+    usarse caducan.
+    """
+
+    def __init__(self, max_sessions=32, ttl=30 * 60):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._datos = OrderedDict()  # token -> (último uso, DataFrame)
+        self._versiones = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _purgar(self, ahora):
+        while self._datos:
+            token, (ultimo_uso, _) = next(iter(self._datos.items()))
+            if ahora - ultimo_uso <= self.ttl and len(self._datos) <= self.max_sessions:
+                break
+            del self._datos[token]
+
+    def put(self, df, token=None, version=None):
+        """
+        Guarda 'df' para la sesión 'token' (o para una nueva si no se da) y devuelve
+        lo que debe guardar el navegador: el token y una versión que cambia en cada
+        escritura, para que los callbacks que dependen del Store se disparen. Si los
+        datos son compartidos entre sesiones, 'version' es la suya (la de DataPublisher).
+        """
+        token = token or uuid.uuid4().hex
+        ahora = time.monotonic()
+        with self._lock:
+            self._datos[token] = (ahora, df)
+            self._datos.move_to_end(token)
+            self._purgar(ahora)
+            return {'token': token, 'version': next(self._versiones) if version is None else version}
+
+    def get(self, token):
+        """DataFrame de la sesión, o None si no existe o ya caducó."""
+        ahora = time.monotonic()
+        with self._lock:
+            self._purgar(ahora)
+            if token not in self._datos:
+                return None
+            _, df = self._datos[token]
+            self._datos[token] = (ahora, df)
+            self._datos.move_to_end(token)
+            return df
+
+    def per_version(self, build, maxsize=8):
+        """
+        Devuelve get(token, version) -> build(df), guardando el resultado por versión de
+        los datos: las sesiones que ven la misma versión comparten, p.ej., un único índice
+        o cubo en lugar de construir uno cada una. None si la sesión ya no existe.
+        """
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        def get(token, version):
+            with lock:
+                if version in cache:
+                    cache.move_to_end(version)
+                    return cache[version]
+            df = self.get(token)
+            if df is None:
+                return None
+            result = build(df)
+            with lock:
+                cache[version] = result
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        return get
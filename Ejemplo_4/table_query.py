@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# Operadores del lenguaje de filtro de dash_table (filter_query), del más largo al más
+# corto para que '>=' no se lea como '>' seguido de '='
+OPERATORS = [
+    ('ge', ('ge ', '>=')), ('le', ('le ', '<=')), ('lt', ('lt ', '<')), ('gt', ('gt ', '>')),
+    ('ne', ('ne ', '!=')), ('eq', ('eq ', '=')), ('contains', ('contains ',)),
+    ('datestartswith', ('datestartswith ',)),
+]
+
+
+def split_filter_part(filter_part):
+    """
+    '{Ventas} >= 100' -> ('Ventas', 'ge', 100.0); (None, None, None) si no se entiende.
+    Para 'contains' y 'datestartswith' el valor se deja siempre como texto.
+    """
+    for operator, spellings in OPERATORS:
+        for spelling in spellings:
+            if spelling in filter_part:
+                name_part, value_part = filter_part.split(spelling, 1)
+                name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+                value_part = value_part.strip()
+                quote = value_part[:1]
+                if quote in ("'", '"', '`') and value_part.endswith(quote) and len(value_part) > 1:
+                    value = value_part[1:-1].replace('\\' + quote, quote)
+                elif operator in ('contains', 'datestartswith'):
+                    value = value_part
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                return name, operator, value
+    return None, None, None
+
+
+def filter_mask(df, filter_query):
+    """Máscara booleana de las filas que cumplen 'filter_query' (None si no hay filtro)."""
+    mask = None
+    for part in (filter_query or '').split(' && '):
+        name, operator, value = split_filter_part(part)
+        if name not in df.columns:
+            continue
+        column = df[name]
+        text_operator = operator in ('contains', 'datestartswith')
+        numeric = pd.api.types.is_numeric_dtype(column)
+        if numeric and not text_operator and not isinstance(value, float):
+            # Un texto comparado con una columna numérica no es un filtro válido: se ignora
+            continue
+        if text_operator or not numeric:
+            column = column.astype(str)
+            value = str(value)
+        if operator == 'contains':
+            part_mask = column.str.contains(value, regex=False)
+        elif operator == 'datestartswith':
+            part_mask = column.str.startswith(value)
+        else:
+            part_mask = getattr(column, operator)(value)
+        part_mask = part_mask.to_numpy()
+        mask = part_mask if mask is None else mask & part_mask
+    return mask
+
+
+class TableIndex:
+    """
+    Tabla de detalle paginada en el servidor (page_action/sort_action/filter_action =
+    'custom'): para cada consulta solo se devuelve la página pedida.
+
+    El orden de cada columna (argsort) se calcula una vez y se reutiliza: ordenar por
+    una columna con un filtro activo es quedarse, en ese orden precalculado, con las
+    filas de la máscara, sin volver a ordenar.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._orders = {}
+
+    def order(self, column):
+        """Posiciones de las filas ordenadas por 'column' de forma ascendente."""
+        if column not in self._orders:
+            values = self.df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Orden alfabético de las etiquetas, no el de las categorías
+                values = values.astype(str)
+            self._orders[column] = np.argsort(values.to_numpy(), kind='stable')
+        return self._orders[column]
+
+    def query(self, page_current=0, page_size=15, sort_by=None, filter_query='', row_mask=None):
+        """
+        Devuelve (filas de la página como records, total de filas que cumplen el filtro).
+        'row_mask' es una selección previa de filas (p.ej. la de los filtros del panel).
+        """
+        mask = filter_mask(self.df, filter_query)
+        if row_mask is not None:
+            mask = row_mask if mask is None else mask & row_mask
+        if sort_by and len(sort_by) == 1:
+            rows = self.order(sort_by[0]['column_id'])
+            if sort_by[0]['direction'] == 'desc':
+                rows = rows[::-1]
+            if mask is not None:
+                rows = rows[mask[rows]]
+        else:
+            rows = np.arange(len(self.df)) if mask is None else np.flatnonzero(mask)
+            if sort_by:
+                # Varias columnas: se ordenan solo las filas filtradas
+                subset = self.df.iloc[rows].reset_index(drop=True).sort_values(
+                    [s['column_id'] for s in sort_by],
+                    ascending=[s['direction'] == 'asc' for s in sort_by],
+                    kind='stable',
+                    key=lambda c: c.astype(str) if isinstance(c.dtype, pd.CategoricalDtype) else c
+                )
+                rows = rows[subset.index.to_numpy()]
+        start = (page_current or 0) * page_size
+        page = self.df.iloc[rows[start:start + page_size]]
+        return page.to_dict('records'), len(rows)
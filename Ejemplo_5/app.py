@@ -1,29 +1,19 @@
-import pandas as pd
+import os
+import sys
 import dash
 from dash import dcc, html, dash_table
 from dash.dependencies import Input, Output  # Añadido Output
 import plotly.express as px
-from sklearn.cluster import KMeans
+# Módulos compartidos entre ejemplos (carpeta comun/ en la raíz del repositorio)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.precalculo import FigurasPrecalculadas
+from instantanea import cargar_datos
 
-# === 1) Cargar datos y renombrar columna de unidad de medida ===
-df = pd.read_excel("datos.xlsx", engine="openpyxl")
-df.rename(columns={"U._DE_MEDIDA": "UNIDAD_MEDIDA"}, inplace=True)
-
-# === 2) Limpiar y convertir columnas numéricas ===
-for col in ["CANTIDAD", "PRECIO_UNITARIO", "VALOR_TOTAL"]:
-    df[col] = pd.to_numeric(
-        df[col].astype(str).str.replace(",", ".", regex=False),
-        errors="coerce"
-    )
-df = df.drop_duplicates().dropna(subset=["CANTIDAD", "PRECIO_UNITARIO", "VALOR_TOTAL"])
-
-# === 3) Estadísticos descriptivos ===
-stats = df[["CANTIDAD", "PRECIO_UNITARIO", "VALOR_TOTAL"]].describe().reset_index()
-
-# === 4) Clustering (3 grupos sobre cantidad y precio) ===
-X = df[["CANTIDAD", "PRECIO_UNITARIO"]]
-kmeans = KMeans(n_clusters=3, random_state=0).fit(X)
-df["cluster"] = kmeans.labels_.astype(str)
+# === 1-4) Cargar y limpiar datos, estadísticos descriptivos y clustering ===
+# (ver instantanea.preparar; el resultado se guarda en .cache/ por hash de datos.xlsx)
+datos = cargar_datos("datos.xlsx")
+df = datos["df"]
+stats = datos["stats"]
 
 # === 5) Crear la app Dash ===
 app = dash.Dash(__name__)
@@ -126,11 +116,7 @@ app.layout = html.Div([
 ])
 
 # === 6) Callback para la pestaña 5 ===
-@app.callback(
-    Output("graf-cant-um-municipio", "figure"),
-    Input("filtro-municipio", "value")
-)
-def mostrar_cantidad_por_um(municipio):
+def figura_cantidad_por_um(municipio):
     dff = df[df["MUNICIPIO_VENTA"] == municipio]
     agg = (
         dff.groupby("UNIDAD_MEDIDA")["CANTIDAD"]
@@ -147,6 +133,18 @@ def mostrar_cantidad_por_um(municipio):
     )
     return fig
 
+# Los municipios son un conjunto fijo: se generan todas las figuras al arrancar
+# (en paralelo, ya serializadas) y el callback solo devuelve la guardada
+figuras_municipio = FigurasPrecalculadas(figura_cantidad_por_um)
+figuras_municipio.precalcular(sorted(df["MUNICIPIO_VENTA"].unique()))
+
+@app.callback(
+    Output("graf-cant-um-municipio", "figure"),
+    Input("filtro-municipio", "value")
+)
+def mostrar_cantidad_por_um(municipio):
+    return figuras_municipio.figura(municipio)
+
 # === 7) Ejecutar servidor ===
 if __name__ == "__main__":
     app.run(debug=True)
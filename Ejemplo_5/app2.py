@@ -1,32 +1,20 @@
-import pandas as pd
+import os
+import sys
 import dash
 import dash_bootstrap_components as dbc
 from dash import dcc, html, dash_table
 from dash.dependencies import Input, Output
 import plotly.express as px
-from sklearn.cluster import KMeans
+# Módulos compartidos entre ejemplos (carpeta comun/ en la raíz del repositorio)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.precalculo import FigurasPrecalculadas
+from instantanea import cargar_datos
 
-# === 1) Cargar y limpiar datos ===
-df = pd.read_excel("datos.xlsx", engine="openpyxl")
-df.rename(columns={"U._DE_MEDIDA": "UNIDAD_MEDIDA"}, inplace=True)
-
-# Convertir campos numéricos (posible coma decimal) a float
-for col in ["CANTIDAD", "PRECIO_UNITARIO", "VALOR_TOTAL"]:
-    df[col] = (
-        df[col]
-        .astype(str)
-        .str.replace(",", ".", regex=False)
-        .pipe(pd.to_numeric, errors="coerce")
-    )
-df = df.drop_duplicates().dropna(subset=["CANTIDAD", "PRECIO_UNITARIO", "VALOR_TOTAL"])
-
-# === 2) Estadísticos descriptivos ===
-stats = df[["CANTIDAD", "PRECIO_UNITARIO", "VALOR_TOTAL"]].describe().reset_index()
-
-# === 3) Clustering ===
-X = df[["CANTIDAD", "PRECIO_UNITARIO"]]
-kmeans = KMeans(n_clusters=3, random_state=0).fit(X)
-df["cluster"] = kmeans.labels_.astype(str)
+# === 1-3) Cargar y limpiar datos, estadísticos descriptivos y clustering ===
+# Se procesan una vez y se guardan en .cache/, con clave el hash de datos.xlsx
+datos = cargar_datos("datos.xlsx")
+df = datos["df"]
+stats = datos["stats"]
 
 # === 4) Inicializar la app Dash con un tema Bootstrap moderno ===
 app = dash.Dash(
@@ -281,11 +269,7 @@ def update_ranking(canales, proveedores, productos, precio_range):
     return fig
 
 # Callback Unidades por Municipio
-@app.callback(
-    Output("graph-unidades", "figure"),
-    Input("filter-municipio-unidades", "value")
-)
-def update_units_by_municipio(municipio):
+def figura_unidades_por_municipio(municipio):
     dff = df[df["MUNICIPIO_VENTA"] == municipio]
     agg = (
         dff.groupby("UNIDAD_MEDIDA")["CANTIDAD"]
@@ -300,6 +284,17 @@ def update_units_by_municipio(municipio):
     )
     return fig
 
+# Una figura por municipio, generadas al arrancar con un pool de hilos y ya serializadas
+figuras_municipio = FigurasPrecalculadas(figura_unidades_por_municipio)
+figuras_municipio.precalcular(sorted(df["MUNICIPIO_VENTA"].unique()))
+
+@app.callback(
+    Output("graph-unidades", "figure"),
+    Input("filter-municipio-unidades", "value")
+)
+def update_units_by_municipio(municipio):
+    return figuras_municipio.figura(municipio)
+
 # === 7) Ejecutar servidor ===
 if __name__ == "__main__":
     app.run(debug=True)
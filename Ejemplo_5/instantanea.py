@@ -0,0 +1,65 @@
+import hashlib
+import os
+import sys
+
+from numericos import COLUMNAS_NUMERICAS, leer_excel
+
+# Módulos compartidos entre ejemplos (carpeta comun/ en la raíz del repositorio)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun import cache
+
+# Cambiar este número invalida todas las instantáneas (p.ej. si cambia la limpieza o el clustering)
+VERSION_PROCESO = 1
+
+
+def hash_archivo(ruta, tam_bloque=1 << 20):
+    """SHA-256 del contenido del archivo, leído por bloques."""
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(tam_bloque), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def preparar(ruta):
+    """
+    Lectura y limpieza del Excel, estadísticos descriptivos y clustering (3 grupos
+    sobre cantidad y precio). Devuelve un diccionario con el DataFrame limpio (con la
+    columna 'cluster'), la tabla de estadísticos y el informe de conversión numérica.
+    """
+    # Solo hace falta si no hay instantánea; importar scikit-learn ya cuesta un segundo
+    from sklearn.cluster import KMeans
+
+    # Las columnas numéricas (coma decimal, puntos de miles) se convierten al leer, por bloques
+    df, informe = leer_excel(ruta)
+    df.rename(columns={"U._DE_MEDIDA": "UNIDAD_MEDIDA"}, inplace=True)
+    df = df.drop_duplicates().dropna(subset=COLUMNAS_NUMERICAS)
+
+    stats = df[COLUMNAS_NUMERICAS].describe().reset_index()
+
+    kmeans = KMeans(n_clusters=3, random_state=0).fit(df[["CANTIDAD", "PRECIO_UNITARIO"]])
+    df["cluster"] = kmeans.labels_.astype(str)
+    return {'df': df, 'stats': stats, 'informe': informe}
+
+
+def cargar_datos(ruta="datos.xlsx", usar_cache=True):
+    """
+    Resultado de preparar(ruta), guardado en una instantánea binaria (pickle) junto
+    al Excel. La clave es el hash del contenido del Excel y VERSION_PROCESO: mientras
+    no cambien, los siguientes arranques (y cada worker nuevo) cargan la instantánea
+    sin volver a leer el Excel ni ajustar KMeans. Incluye 'firma', que identifica
+    los datos y sirve como versión.
+    """
+    firma = (VERSION_PROCESO, hash_archivo(ruta))
+    guardado = cache.leer(ruta, firma) if usar_cache else None
+    if guardado is not None:
+        return guardado
+
+    datos = preparar(ruta)
+    datos['firma'] = firma
+    print("Celdas de texto convertidas a número / no convertibles:")
+    print(datos['informe'])
+
+    if usar_cache:
+        cache.guardar(ruta, datos)
+    return datos
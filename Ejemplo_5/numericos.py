@@ -0,0 +1,91 @@
+from itertools import islice
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from openpyxl import load_workbook
+
+COLUMNAS_NUMERICAS = ["CANTIDAD", "PRECIO_UNITARIO", "VALOR_TOTAL"]
+
+# Formatos de texto aceptados (después de quitar espacios):
+# coma decimal con puntos de miles en grupos de tres ('1.234.567,89', '1.234')
+_CON_MILES = r"^[+-]?\d{1,3}(\.\d{3})+(,\d+)?$"
+# coma decimal sin separador de miles ('38,5', '6055,00', '180')
+_COMA_DECIMAL = r"^[+-]?\d+(,\d+)?$"
+# punto decimal cuando no puede ser un separador de miles ('3.35', '0.5')
+_PUNTO_DECIMAL = r"^[+-]?\d*\.\d+$"
+
+
+def _texto_a_numero(texto):
+    """Convierte un array de Arrow de textos a float64 (null si no tiene un formato válido)."""
+    texto = pc.utf8_trim_whitespace(texto)
+    miles = pc.match_substring_regex(texto, _CON_MILES)
+    valido = pc.or_(pc.or_(miles, pc.match_substring_regex(texto, _COMA_DECIMAL)),
+                    pc.match_substring_regex(texto, _PUNTO_DECIMAL))
+    normalizado = pc.if_else(miles, pc.replace_substring(texto, ".", ""), texto)
+    normalizado = pc.replace_substring(normalizado, ",", ".")
+    normalizado = pc.if_else(valido, normalizado, pa.scalar(None, pa.string()))
+    return pc.cast(normalizado, pa.float64())
+
+
+def a_numero(serie):
+    """
+    Convierte una columna (números de Excel mezclados con textos como '38,5' o
+    '1.234,5') a float64. Los números ya leídos como tales no se tocan; solo las
+    celdas de texto pasan, todas a la vez, por las funciones de texto de Arrow.
+
+    Devuelve (serie convertida, celdas de texto convertidas, celdas no convertibles).
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype("float64"), 0, 0
+    es_texto = (serie.map(type) == str).to_numpy()
+    numeros = pd.to_numeric(serie.where(~es_texto), errors="coerce").astype("float64")
+    # Celdas que no son ni número ni texto (fechas, booleanos de Excel...)
+    invalidos = int((numeros.isna().to_numpy() & serie.notna().to_numpy() & ~es_texto).sum())
+    if not es_texto.any():
+        return numeros, 0, invalidos
+    convertidos = _texto_a_numero(pa.array(serie[es_texto].to_numpy(), type=pa.string()))
+    numeros[es_texto] = convertidos.to_numpy(zero_copy_only=False)
+    invalidos += convertidos.null_count
+    return numeros, int(es_texto.sum()) - convertidos.null_count, invalidos
+
+
+def convertir_numericos(df, columnas=COLUMNAS_NUMERICAS):
+    """
+    Convierte 'columnas' de 'df' a float64 (en el mismo DataFrame) y devuelve un
+    informe con cuántas celdas de texto hubo que convertir y cuántas no se pudieron
+    (quedan como NaN) en cada columna.
+    """
+    informe = {}
+    for col in columnas:
+        df[col], convertidas, invalidas = a_numero(df[col])
+        informe[col] = {"texto_convertido": convertidas, "invalidos": invalidas}
+    return pd.DataFrame.from_dict(informe, orient="index")
+
+
+def leer_excel(ruta, columnas=COLUMNAS_NUMERICAS, tam_bloque=50_000):
+    """
+    Lee la primera hoja de un Excel por bloques de 'tam_bloque' filas (openpyxl en
+    modo solo lectura) y convierte las columnas numéricas de cada bloque antes de
+    leer el siguiente: los textos de un bloque se descartan en cuanto se convierten,
+    así que nunca están todos en memoria a la vez.
+
+    Devuelve (DataFrame, informe de convertir_numericos sumado de todos los bloques).
+    """
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        filas = libro.worksheets[0].iter_rows(values_only=True)
+        encabezado = list(next(filas))
+        bloques, informes = [], []
+        while True:
+            leidas = list(islice(filas, tam_bloque))
+            # Las filas vacías (p.ej. con formato pero sin datos) se descartan, como en read_excel
+            bloque = pd.DataFrame([f for f in leidas if any(v is not None for v in f)], columns=encabezado)
+            informes.append(convertir_numericos(bloque, columnas))
+            bloques.append(bloque)
+            if len(leidas) < tam_bloque:
+                break
+    finally:
+        libro.close()
+    df = pd.concat(bloques, ignore_index=True) if len(bloques) > 1 else bloques[0]
+    return df.infer_objects(), sum(informes[1:], informes[0])
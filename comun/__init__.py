@@ -0,0 +1,4 @@
+"""
+Módulos compartidos por varios ejemplos. Cada ejemplo se ejecuta desde su propia
+carpeta, así que los que los usan añaden la raíz del repositorio a sys.path.
+"""
@@ -0,0 +1,41 @@
+import os
+import pickle
+
+DIRECTORIO_CACHE = '.cache'
+
+
+def ruta_cache(ruta):
+    """Archivo de caché de 'ruta': .cache/<nombre>.pkl en la misma carpeta."""
+    return os.path.join(os.path.dirname(ruta) or '.', DIRECTORIO_CACHE, os.path.basename(ruta) + '.pkl')
+
+
+def leer(ruta, firma):
+    """
+    Diccionario guardado con 'guardar' para 'ruta', si existe y su clave 'firma'
+    coincide con 'firma'. Si no existe, es de otra firma o no se puede leer, None.
+    """
+    archivo = ruta_cache(ruta)
+    if not os.path.exists(archivo):
+        return None
+    try:
+        with open(archivo, 'rb') as f:
+            guardado = pickle.load(f)
+        if guardado['firma'] == firma:
+            return guardado
+    except Exception as e:
+        print(f"Caché ilegible ({archivo}), se vuelve a calcular: {e}")
+    return None
+
+
+def guardar(ruta, datos):
+    """
+    Guarda el diccionario 'datos' (con su clave 'firma') como caché de 'ruta'. Se
+    escribe en un temporal y se renombra: otro proceso nunca lee un pickle a medio
+    escribir.
+    """
+    archivo = ruta_cache(ruta)
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    temporal = f'{archivo}.{os.getpid()}.tmp'
+    with open(temporal, 'wb') as f:
+        pickle.dump(datos, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, archivo)
@@ -0,0 +1,52 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from plotly.io.json import to_json_plotly
+
+
+class FigurasPrecalculadas:
+    """
+    Figuras de un selector con pocas opciones (p.ej. un dropdown de regiones),
+    construidas todas de antemano y guardadas ya serializadas a JSON.
+
+    'construir(opcion)' devuelve la figura (objeto de Plotly o diccionario) de una
+    opción. 'precalcular' las construye una tras otra y las serializa en paralelo con
+    un pool de hilos; 'figura' devuelve la guardada, y solo vuelve a generarlas todas
+    cuando cambia la versión de los datos.
+    """
+
+    def __init__(self, construir, max_workers=4):
+        self.construir = construir
+        self.max_workers = max_workers
+        self.version = None
+        self.opciones = []
+        self._json = {}
+        self._lock = threading.Lock()
+
+    def _serializar(self, opcion):
+        return to_json_plotly(self.construir(opcion))
+
+    def precalcular(self, opciones, version=None):
+        """Construye y serializa la figura de cada opción para la 'version' de los datos."""
+        opciones = list(opciones)
+        # Construir figuras de Plotly desde varios hilos a la vez no es seguro (la primera
+        # vez se cargan sus validadores de forma perezosa): solo la serialización va al pool
+        figuras = [self.construir(opcion) for opcion in opciones]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            serializadas = dict(zip(opciones, pool.map(to_json_plotly, figuras)))
+        with self._lock:
+            self.opciones, self._json, self.version = opciones, serializadas, version
+
+    def figura(self, opcion, version=None):
+        """
+        Figura de 'opcion' como diccionario listo para enviar. Si los datos cambiaron
+        de versión se regeneran todas; una opción desconocida se construye al momento.
+        """
+        if version != self.version:
+            self.precalcular(self.opciones, version)
+        serializada = self._json.get(opcion)
+        if serializada is None:
+            serializada = self._serializar(opcion)
+        # Cada llamada recibe su propia copia: nadie modifica la guardada
+        return json.loads(serializada)